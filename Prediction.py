@@ -1,5 +1,8 @@
 import streamlit as st
 from input.input_form import input_form
+from utils.profiling import render_profile_panel, start_run
+
+start_run('main')
 
 # Update last visited page to track page navigation
 # This must be done BEFORE input_form() to ensure proper page switch detection
@@ -25,4 +28,6 @@ st.write(
 st.write("With our disease prediction app, we aim to change that. By allowing users to input basic biological data, lifestyle information, medical history, and common lab results from routine health checkups, our app can help estimate an individual’s risk of developing diabetes, hypertension, cardiovascular disease (CVD), or chronic kidney disease (CKD).")
 st.write("We train our models using the National Health and Nutrition Examination Survey (NHANES) dataset. Data source can be found here: [link](https://wwwn.cdc.gov/nchs/nhanes/continuousnhanes/default.aspx?Cycle=2021-2023).")
 
-input_form()
\ No newline at end of file
+input_form()
+
+render_profile_panel()
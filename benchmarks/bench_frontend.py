@@ -0,0 +1,198 @@
+"""
+Micro-benchmarks for the frontend hot paths.
+
+Runs headless (no Streamlit server) and writes JSON results that can be
+compared between commits:
+
+    python benchmarks/bench_frontend.py --output bench.json
+    python benchmarks/bench_frontend.py --baseline bench.json --threshold 0.25
+
+With --baseline the run exits with status 1 if any benchmark's median is
+more than `threshold` slower than in the baseline (and by more than
+--min-delta-us, so sub-microsecond noise does not fail the run).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+# display.py reads its JSON configs relative to the working directory;
+# --output/--baseline paths stay relative to where the script was started
+INVOCATION_DIR = os.getcwd()
+os.chdir(PROJECT_ROOT)
+
+from streamlit.logger import set_log_level
+
+set_log_level("error")
+
+from input.data_validation import compute_bmi, format_post_data
+from input.input_form import _convert_api_to_frontend_format
+from models.feature_map import FeatureMap
+from utils.constants import OPTIONAL_FEATURE_SET, REQUIRED_FEATURE_SET
+from utils.display import _generate_comparison_card_html, _generate_factor_html, convert_api_response_to_display_format
+from utils.synthetic_responses import generate_prediction_response
+
+# Response sizes: SHAP factors per direction (increasing and decreasing) per disease
+RESPONSE_SIZES = {
+    "small": 2,
+    "typical": 10,
+    "pathological": 300
+}
+
+
+def _filled_feature_maps():
+    required = FeatureMap(REQUIRED_FEATURE_SET)
+    optional = FeatureMap(OPTIONAL_FEATURE_SET)
+    for i, key in enumerate(sorted(required.keys())):
+        required.update(key, float(i))
+    for i, key in enumerate(sorted(optional.keys())):
+        optional.update(key, float(i))
+    return required, optional
+
+
+def build_benchmarks():
+    """Return {name: zero-argument callable} for every benchmarked path and size."""
+    required, optional = _filled_feature_maps()
+    required_keys = sorted(required.keys())
+
+    def feature_map_update():
+        for key in required_keys:
+            required.update(key, 1.0)
+
+    def feature_map_get():
+        for key in required_keys:
+            required.get(key)
+
+    benchmarks = {
+        "compute_bmi": lambda: compute_bmi(90.0, 175.0),
+        "format_post_data": lambda: format_post_data(required, optional),
+        "FeatureMap.update": feature_map_update,
+        "FeatureMap.get": feature_map_get,
+        "FeatureMap.containsNone": required.containsNone,
+        "_generate_comparison_card_html": lambda: _generate_comparison_card_html("Diabetes", 45.0, 31.25)
+    }
+
+    for size, factors_per_direction in RESPONSE_SIZES.items():
+        api_response = generate_prediction_response(
+            increasing_factors=factors_per_direction, decreasing_factors=factors_per_direction, recommendation_sentences=2
+        )
+        frontend_response = _convert_api_to_frontend_format(api_response)
+        display_data = convert_api_response_to_display_format(frontend_response, {})
+        factor_cards = [
+            (factor, factor["recommendation"])
+            for factors in display_data["risk_factors_by_disease"].values()
+            for factor in factors
+        ]
+
+        def render_factor_cards(cards=factor_cards):
+            for index, (factor, recommendation) in enumerate(cards, 1):
+                _generate_factor_html(factor, index, recommendation)
+
+        benchmarks[f"_convert_api_to_frontend_format[{size}]"] = (
+            lambda response=api_response: _convert_api_to_frontend_format(response)
+        )
+        benchmarks[f"convert_api_response_to_display_format[{size}]"] = (
+            lambda response=frontend_response: convert_api_response_to_display_format(response, {})
+        )
+        benchmarks[f"_generate_factor_html[{size}]"] = render_factor_cards
+    return benchmarks
+
+
+def time_benchmark(func, repeat):
+    """Return per-call timings in microseconds over `repeat` rounds of an auto-sized loop."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    rounds = timer.repeat(repeat=repeat, number=number)
+    per_call = [seconds / number * 1e6 for seconds in rounds]
+    return {
+        "median_us": statistics.median(per_call),
+        "min_us": min(per_call),
+        "stdev_us": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        "loops": number,
+        "repeat": repeat
+    }
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run(selected=None, repeat=7):
+    benchmarks = build_benchmarks()
+    results = {}
+    for name, func in benchmarks.items():
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        results[name] = time_benchmark(func, repeat)
+        print(f"{name:<55} {results[name]['median_us']:>12.2f} us  (min {results[name]['min_us']:.2f})")
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform()
+        },
+        "results": results
+    }
+
+
+def find_regressions(current, baseline, threshold, min_delta_us):
+    """Return (name, baseline median, current median) for every benchmark that got slower than allowed."""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        before, after = previous["median_us"], result["median_us"]
+        if after > before * (1 + threshold) and after - before > min_delta_us:
+            regressions.append((name, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the frontend hot paths without a Streamlit server.")
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown of a median as a fraction of the baseline (default 0.25)")
+    parser.add_argument("--min-delta-us", type=float, default=1.0,
+                        help="ignore slowdowns smaller than this many microseconds (default 1.0)")
+    parser.add_argument("--repeat", type=int, default=7, help="timing rounds per benchmark (default 7)")
+    parser.add_argument("--filter", action="append",
+                        help="only run benchmarks whose name contains this string (repeatable)")
+    args = parser.parse_args(argv)
+
+    current = run(args.filter, args.repeat)
+    if args.output:
+        with open(os.path.join(INVOCATION_DIR, args.output), "w") as f:
+            json.dump(current, f, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(os.path.join(INVOCATION_DIR, args.baseline)) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(current, baseline, args.threshold, args.min_delta_us)
+    if not regressions:
+        print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+        return 0
+    for name, before, after in regressions:
+        print(f"REGRESSION {name}: {before:.2f} us -> {after:.2f} us ({after / before - 1:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""
+Replay captured backend traffic and diff the responses.
+
+Capture real traffic first by starting the app with CAPTURE_LOG_PATH set
+(see utils/traffic_capture.py), then re-send it:
+
+    python benchmarks/replay_traffic.py logs/capture.jsonl --base-url http://localhost:8000
+    python benchmarks/replay_traffic.py logs/capture.jsonl --speed 10 --concurrency 16
+    python benchmarks/replay_traffic.py logs/capture.jsonl --speed 0 --report drift.json
+
+Requests keep their original spacing divided by --speed (0 sends them as
+fast as --concurrency allows). Each replayed response is compared with the
+captured one; numbers may differ by --tolerance. The run exits with status 1
+when any response drifted or failed.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from utils.api_client import API_BASE_URL
+from utils.traffic_capture import CAPTURE_LOG_BACKUPS, anonymize_response, read_capture
+
+# Report at most this many differences per response
+MAX_DIFFS_PER_RESPONSE = 20
+
+
+def diff_json(expected, actual, tolerance=1e-6, path="$"):
+    """Return a list of (path, expected, actual) where two JSON values differ."""
+    if isinstance(expected, bool) or isinstance(actual, bool):
+        return [] if expected == actual else [(path, expected, actual)]
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        if math.isclose(expected, actual, rel_tol=tolerance, abs_tol=tolerance):
+            return []
+        return [(path, expected, actual)]
+    if type(expected) is not type(actual):
+        return [(path, expected, actual)]
+    if isinstance(expected, dict):
+        diffs = []
+        for key in sorted(set(expected) | set(actual), key=str):
+            child = f"{path}.{key}"
+            if key not in actual:
+                diffs.append((child, expected[key], "<missing>"))
+            elif key not in expected:
+                diffs.append((child, "<missing>", actual[key]))
+            else:
+                diffs.extend(diff_json(expected[key], actual[key], tolerance, child))
+        return diffs
+    if isinstance(expected, list):
+        diffs = []
+        if len(expected) != len(actual):
+            diffs.append((f"{path}.length", len(expected), len(actual)))
+        for index, (a, b) in enumerate(zip(expected, actual)):
+            diffs.extend(diff_json(a, b, tolerance, f"{path}[{index}]"))
+        return diffs
+    return [] if expected == actual else [(path, expected, actual)]
+
+
+def _send(record, base_url, timeout):
+    start = time.perf_counter()
+    try:
+        response = requests.post(f"{base_url}{record['endpoint']}", json=record["request"], timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        return {"status": None, "error": type(e).__name__, "latency_ms": (time.perf_counter() - start) * 1000, "body": None}
+    latency_ms = (time.perf_counter() - start) * 1000
+    try:
+        body = response.json()
+    except ValueError:
+        body = response.text
+    return {"status": response.status_code, "error": None, "latency_ms": latency_ms, "body": body}
+
+
+def replay(records, base_url, speed=1.0, concurrency=8, timeout=30):
+    """
+    Re-send captured records on their original schedule scaled by `speed`.
+
+    Returns the replay results in record order. A request is never sent
+    early, but may start late when all `concurrency` workers are busy.
+    """
+    if not records:
+        return []
+    first = records[0]["t"]
+    start = time.monotonic()
+    futures = []
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="replay") as pool:
+        for record in records:
+            if speed > 0:
+                delay = (record["t"] - first) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            futures.append(pool.submit(_send, record, base_url, timeout))
+    return [future.result() for future in futures]
+
+
+def compare(records, results, tolerance):
+    """Diff every replayed response against its capture; returns one report entry per record."""
+    report = []
+    for index, (record, result) in enumerate(zip(records, results)):
+        diffs = []
+        if result["status"] != record["status"]:
+            diffs.append(("$status", record["status"], result["status"]))
+        if result["error"] is None and record["response"] is not None:
+            # Captured responses were anonymized; compare like with like
+            diffs.extend(diff_json(record["response"], anonymize_response(result["body"]), tolerance))
+        report.append({
+            "index": index,
+            "captured_at": record["t"],
+            "status": result["status"],
+            "error": result["error"],
+            "captured_latency_ms": record["latency_ms"],
+            "latency_ms": round(result["latency_ms"], 3),
+            "diff_count": len(diffs),
+            "diffs": [
+                {"path": path, "expected": expected, "actual": actual}
+                for path, expected, actual in diffs[:MAX_DIFFS_PER_RESPONSE]
+            ]
+        })
+    return report
+
+
+def _latency_summary(values):
+    if not values:
+        return "n/a"
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return f"p50 {p50:.0f} ms, p95 {p95:.0f} ms, p99 {p99:.0f} ms"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay captured /prediction traffic and diff the responses.")
+    parser.add_argument("capture", help="capture log written with CAPTURE_LOG_PATH (rotated backups are included)")
+    parser.add_argument("--base-url", default=API_BASE_URL, help=f"backend to replay against (default {API_BASE_URL})")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="replay rate relative to the capture; 0 sends as fast as possible (default 1.0)")
+    parser.add_argument("--concurrency", type=int, default=8, help="maximum requests in flight (default 8)")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds (default 30)")
+    parser.add_argument("--tolerance", type=float, default=1e-6,
+                        help="relative/absolute tolerance for numeric differences (default 1e-6)")
+    parser.add_argument("--limit", type=int, help="replay only the first N captured requests")
+    parser.add_argument("--report", help="write the per-request diff report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    records = read_capture(args.capture, CAPTURE_LOG_BACKUPS)
+    if args.limit:
+        records = records[:args.limit]
+    if not records:
+        print(f"No captured requests in {args.capture}")
+        return 0
+
+    span_seconds = records[-1]["t"] - records[0]["t"]
+    print(f"Replaying {len(records)} requests captured over {span_seconds:.1f} s against {args.base_url}")
+    start = time.perf_counter()
+    results = replay(records, args.base_url.rstrip("/"), args.speed, args.concurrency, args.timeout)
+    elapsed = time.perf_counter() - start
+    report = compare(records, results, args.tolerance)
+
+    drifted = [entry for entry in report if entry["diff_count"] and entry["error"] is None]
+    failed = [entry for entry in report if entry["error"] is not None]
+    print(f"Finished in {elapsed:.1f} s ({len(records) / elapsed:.1f} req/s)")
+    print(f"Captured latency: {_latency_summary([r['latency_ms'] for r in records if r['latency_ms'] is not None])}")
+    print(f"Replay latency:   {_latency_summary([entry['latency_ms'] for entry in report])}")
+    print(f"{len(drifted)} drifted, {len(failed)} failed, {len(report) - len(drifted) - len(failed)} identical")
+    for entry in drifted[:10]:
+        first_diff = entry["diffs"][0]
+        print(f"  #{entry['index']}: {entry['diff_count']} differences, first at {first_diff['path']}: "
+              f"{first_diff['expected']!r} -> {first_diff['actual']!r}")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    return 1 if drifted or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Score NHANES participants with the backend to build the population index.
+
+The local population comparison (utils/population_index.py) reads
+data/population_risk_scores.csv: one row per participant with RIDAGEYR,
+RIAGENDR and the backend's risk (0-100) for every disease type. This script
+produces that file by sending dataset rows to /prediction/all:
+
+    python benchmarks/score_population.py --base-url http://localhost:8000
+    python benchmarks/score_population.py --cycles 2021-2023 --sample 5000 --concurrency 16
+
+Re-run it whenever the models or the dataset change. Participants the
+backend rejects are left out; a disease the backend did not score for a
+participant is left empty.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from streamlit.logger import set_log_level
+
+set_log_level("error")
+
+import pandas as pd
+
+from utils.api_client import API_BASE_URL, PREDICT_ALL_ENDPOINT
+from utils.dataset_store import list_cycles, scan
+from utils.population_index import DISEASE_TYPES, POPULATION_SCORES_PATH
+from utils.traffic_capture import CAPTURED_FEATURES
+
+
+def participant_payload(row, features):
+    """Build a /prediction/all body from one dataset row; missing values are sent as null."""
+    input_data = {}
+    for feature in features:
+        value = row[feature]
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            input_data[feature] = None
+        elif isinstance(value, float) and value.is_integer():
+            # Survey codes are stored as float64; send them as the integers the form sends
+            input_data[feature] = int(value)
+        else:
+            input_data[feature] = value
+    return {"input_data": input_data}
+
+
+def _score(payload, url, timeout):
+    """Return {disease: risk} for one participant, or None if the backend rejected it."""
+    try:
+        response = requests.post(url, json=payload, timeout=timeout)
+    except requests.exceptions.RequestException:
+        return None
+    if response.status_code != 200:
+        return None
+    body = response.json()
+    scores = {}
+    for disease in DISEASE_TYPES:
+        entry = body.get(disease)
+        if isinstance(entry, dict) and "error" not in entry and entry.get("risk") is not None:
+            scores[disease] = float(entry["risk"])
+    return scores
+
+
+def score_population(participants, base_url, concurrency=8, timeout=30, on_progress=None):
+    """
+    Score every participant and return the population scores DataFrame.
+
+    `participants` needs RIDAGEYR and RIAGENDR; every other model feature it
+    has is sent. `on_progress(done, total)` is called as requests finish.
+    """
+    features = [col for col in participants.columns if col in CAPTURED_FEATURES]
+    url = f"{base_url}{PREDICT_ALL_ENDPOINT}"
+    rows = participants.to_dict("records")
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="score-population") as pool:
+        futures = [pool.submit(_score, participant_payload(row, features), url, timeout) for row in rows]
+        results = []
+        for done, future in enumerate(futures, 1):
+            results.append(future.result())
+            if on_progress is not None:
+                on_progress(done, len(futures))
+
+    records = []
+    for row, scores in zip(rows, results):
+        if scores is None:
+            continue
+        records.append(dict({"RIDAGEYR": row["RIDAGEYR"], "RIAGENDR": row["RIAGENDR"]}, **scores))
+    return pd.DataFrame(records, columns=["RIDAGEYR", "RIAGENDR"] + DISEASE_TYPES)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score NHANES participants with the backend for population comparison.")
+    parser.add_argument("--base-url", default=API_BASE_URL, help=f"backend to score with (default {API_BASE_URL})")
+    parser.add_argument("--cycles", nargs="+", help="survey cycles to score (default: all)")
+    parser.add_argument("--sample", type=int, help="score a random sample of N participants instead of all")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for --sample (default 0)")
+    parser.add_argument("--concurrency", type=int, default=8, help="maximum requests in flight (default 8)")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds (default 30)")
+    parser.add_argument("--output", default=str(POPULATION_SCORES_PATH),
+                        help=f"CSV to write (default {POPULATION_SCORES_PATH})")
+    args = parser.parse_args(argv)
+
+    cycles = args.cycles or list(list_cycles())
+    columns = sorted(CAPTURED_FEATURES | {"RIDAGEYR", "RIAGENDR"})
+    participants = scan(cycles, columns=columns).to_pandas()
+    if "RIDAGEYR" not in participants.columns or "RIAGENDR" not in participants.columns:
+        print(f"No participants with age and gender in cycles {', '.join(cycles)}")
+        return 1
+    participants = participants.dropna(subset=["RIDAGEYR", "RIAGENDR"]).drop(columns=["CYCLE"])
+    if args.sample and args.sample < len(participants):
+        participants = participants.sample(args.sample, random_state=args.seed)
+
+    print(f"Scoring {len(participants):,} participants from {', '.join(cycles)} against {args.base_url}")
+    start = time.perf_counter()
+    step = max(len(participants) // 20, 1)
+    scores = score_population(
+        participants, args.base_url.rstrip("/"), args.concurrency, args.timeout,
+        on_progress=lambda done, total: print(f"  {done:,}/{total:,}") if done % step == 0 or done == total else None
+    )
+    elapsed = time.perf_counter() - start
+    print(f"Finished in {elapsed:.1f} s; {len(scores):,} scored, {len(participants) - len(scores):,} rejected")
+    for disease in DISEASE_TYPES:
+        print(f"  {disease}: {int(scores[disease].notna().sum()):,} scores")
+    if scores.empty:
+        return 1
+
+    tmp_path = f"{args.output}.{os.getpid()}.tmp"
+    scores.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, args.output)
+    print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
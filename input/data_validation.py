@@ -1,3 +1,5 @@
+from utils.profiling import profiled
+from utils.tracing import traced
 from utils.constants import ALCOHOL_CONSUMPTION_RANGE, FAIMILY_INCOME_MAP, PHYSICAL_ACTIVITY_MAP, RACE_MAP,REQUIRED_FIELDS, OPTIONAL_FIELDS, SMOKING_FREQUENCY_MAP
 
 
@@ -12,6 +14,8 @@ def compute_bmi(weight_kg, height_cm):
         return None
 
 
+@traced()
+@profiled()
 def format_post_data(required_features, optional_features):
     """Format the collected form values into the expected POST data structure."""
     data = {}
@@ -29,6 +33,8 @@ def format_post_data(required_features, optional_features):
     return data
 
 
+@traced()
+@profiled()
 def validate_form_input(st):
     """Validate all required form inputs. Returns dict mapping field keys to human-readable labels for missing fields."""
     missing_fields = {}
@@ -42,6 +48,8 @@ def validate_form_input(st):
     return missing_fields
 
 
+@traced()
+@profiled()
 def collect_form_values(st, required_fields_map, optional_fields_map):
     
     field_pending_processing = {"Weight", "Height", "Race", "Annual Family Income", "Smoking Frequency", "Alcohol", "Physical Activity"}
@@ -2,16 +2,21 @@ import streamlit as st
 import requests
 import os
 import sys
+import time
+from contextlib import nullcontext
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.constants import REQUIRED_FEATURE_SET, OPTIONAL_FEATURE_SET
 from models.feature_map import FeatureMap
 from input.form_components import create_basic_info_section, create_lab_values_section, create_lifestyle_factors_section, create_medical_history_section
 from input.data_validation import format_post_data, validate_form_input, collect_form_values
+from utils.admission import BackendBusy
+from utils.api_client import predict_all
 from utils.display import convert_api_response_to_display_format, display_results
-
-# 支持环境变量配置，本地开发时设置为 http://localhost:8000
-API_BASE_URL = os.getenv("API_BASE_URL", "https://disease-warning-1.onrender.com")
-PREDICT_ALL_URL = f"{API_BASE_URL}/prediction/all"
+from utils.metrics import CONVERSION_LATENCY, SUBMIT_LATENCY, VALIDATION_FAILURES
+from utils.population_index import load_population_index
+from utils.profiling import profiled, stage
+from utils.similarity import load_similarity_index, summarize_outcomes
+from utils.tracing import span, traced
 
 required_features_map = FeatureMap(REQUIRED_FEATURE_SET)
 optional_features_map = FeatureMap(OPTIONAL_FEATURE_SET)
@@ -40,66 +45,84 @@ def input_form():
         )
 
         if submitted:
-            missing_fields = validate_form_input(st)
+            with span("submit", page="main") as submit_span:
+                submitted_at = time.perf_counter()
+                missing_fields = validate_form_input(st)
             
-            if missing_fields:
-                # Store missing fields in session state for rendering feedback
-                st.session_state['validation_errors'] = missing_fields
-                st.error(f"⚠️ Please fill in all required fields highlighted above ({len(missing_fields)} missing)")
-            else:
-                # Clear any previous validation errors
-                st.session_state['validation_errors'] = {}
-                # Set flag to indicate form was submitted (will be used after successful API call)
-                st.session_state.form_just_submitted = True
-                collect_form_values(st, required_features_map, optional_features_map)
-                input = format_post_data(required_features_map, optional_features_map)
-                data = {"input_data": input}
+                if missing_fields:
+                    VALIDATION_FAILURES.inc()
+                    # Store missing fields in session state for rendering feedback
+                    st.session_state['validation_errors'] = missing_fields
+                    st.error(f"⚠️ Please fill in all required fields highlighted above ({len(missing_fields)} missing)")
+                else:
+                    # Clear any previous validation errors
+                    st.session_state['validation_errors'] = {}
+                    # Set flag to indicate form was submitted (will be used after successful API call)
+                    st.session_state.form_just_submitted = True
+                    collect_form_values(st, required_features_map, optional_features_map)
+                    input = format_post_data(required_features_map, optional_features_map)
+                    data = {"input_data": input}
             
-                with st.spinner("Processing your health data..."):
-                    # collect_form_values(st, required_features_map, optional_features_map)
-                    # input = format_post_data(required_features_map, optional_features_map)
-                    # data = {"input_data": input}
+                    with st.spinner("Processing your health data..."):
+                        # collect_form_values(st, required_features_map, optional_features_map)
+                        # input = format_post_data(required_features_map, optional_features_map)
+                        # data = {"input_data": input}
 
-                    try:
-                        response = requests.post(PREDICT_ALL_URL, json=data, timeout=30)
+                        queue_notice = st.empty()
+                        try:
+                            with stage("POST /prediction/all"):
+                                response = predict_all(data, on_queue=lambda position: queue_notice.info(
+                                    f"⏳ The prediction service is busy. You are number {position} in the queue."
+                                ))
+                            queue_notice.empty()
 
-                        if response.status_code == 200:
-                            api_response = response.json()
-                            
-                            # Convert API response to frontend format
-                            converted_response = _convert_api_to_frontend_format(api_response)
+                            if response.status_code == 200:
+                                with span("decode_json"):
+                                    api_response = response.json()
                             
-                            # Convert to display format
-                            display_data = convert_api_response_to_display_format(converted_response)
+                                with CONVERSION_LATENCY.time(page='main'):
+                                    # Convert API response to frontend format
+                                    converted_response = _convert_api_to_frontend_format(api_response, input)
+                                
+                                    # Convert to display format
+                                    display_data = convert_api_response_to_display_format(converted_response)
                             
-                            # Save to session state
-                            st.session_state.prediction_done = True
-                            st.session_state.risk_scores = display_data["risk_scores"]
-                            st.session_state.risk_factors_by_disease = display_data["risk_factors_by_disease"]
-                            st.session_state.factor_recommendations_map = display_data["factor_recommendations_map"]
-                            st.session_state.comparison_data = display_data["comparison_data"]
-                            st.session_state.comparison_data_by_disease = display_data["comparison_data_by_disease"]
-                            st.session_state.selected_disease = None
-                            st.session_state.show_results_on_main_page = True  # Flag to show results on main page
-                            st.session_state.results_page = 'main'  # Mark that results were generated on main page
+                                # Save to session state
+                                st.session_state.prediction_done = True
+                                st.session_state.risk_scores = display_data["risk_scores"]
+                                st.session_state.risk_factors_by_disease = display_data["risk_factors_by_disease"]
+                                st.session_state.factor_recommendations_map = display_data["factor_recommendations_map"]
+                                st.session_state.comparison_data = display_data["comparison_data"]
+                                st.session_state.comparison_data_by_disease = display_data["comparison_data_by_disease"]
+                                st.session_state.similar_individuals = _find_similar_individuals(input, converted_response)
+                                st.session_state.selected_disease = None
+                                st.session_state.show_results_on_main_page = True  # Flag to show results on main page
+                                st.session_state.results_page = 'main'  # Mark that results were generated on main page
+                                SUBMIT_LATENCY.observe(time.perf_counter() - submitted_at, page='main')
                             
-                            # Show success message
-                            st.success("✅ Prediction completed!")
-                            st.rerun()
-                        else:
-                            st.error("API request failed")
-                            try:
-                                error_data = response.json()
-                                st.json(error_data)
-                            except requests.exceptions.JSONDecodeError:
-                                st.text(response.text)
+                                # Show success message
+                                st.success("✅ Prediction completed!")
+                                if submit_span is not None:
+                                    # The results are drawn on the next rerun; continue this trace there
+                                    st.session_state.render_trace = {"trace_id": submit_span.trace_id, "parent_id": submit_span.span_id}
+                                st.rerun()
+                            else:
+                                st.error("API request failed")
+                                try:
+                                    error_data = response.json()
+                                    st.json(error_data)
+                                except requests.exceptions.JSONDecodeError:
+                                    st.text(response.text)
 
-                    except requests.exceptions.ConnectionError as e:
-                        st.error(f"Connection failed: {e}. Please make sure the backend service is running.")
-                    except requests.exceptions.Timeout:
-                        st.error("Request timed out. Please try again.")
-                    except Exception as e:
-                        st.error(f"An error occurred: {str(e)}")
+                        except BackendBusy as e:
+                            queue_notice.empty()
+                            st.error(f"{e}. Please try again in a moment.")
+                        except requests.exceptions.ConnectionError as e:
+                            st.error(f"Connection failed: {e}. Please make sure the backend service is running.")
+                        except requests.exceptions.Timeout:
+                            st.error("Request timed out. Please try again.")
+                        except Exception as e:
+                            st.error(f"An error occurred: {str(e)}")
     
     # Display results below the form if:
     # 1. show_results_on_main_page flag is set (prediction was done on main page)
@@ -109,11 +132,19 @@ def input_form():
     if (st.session_state.get('show_results_on_main_page', False) and 
         st.session_state.get('results_page') == 'main'):
         st.markdown("---")
-        display_results()
+        render_trace = st.session_state.pop('render_trace', None)
+        with span("render", **render_trace) if render_trace else nullcontext():
+            display_results()
 
-def _convert_api_to_frontend_format(api_response):
+@traced()
+@profiled()
+def _convert_api_to_frontend_format(api_response, input_data=None):
     """
     Convert API response format to frontend expected format.
+
+    When the backend omits a disease's `population_comparison` block and
+    `input_data` (the submitted features) is given, the comparison is filled
+    in from the local population index instead.
     
     API format:
     {
@@ -148,6 +179,7 @@ def _convert_api_to_frontend_format(api_response):
     }
     """
     diseases = []
+    population_index = load_population_index() if input_data else None
     
     # Disease name mapping
     disease_name_map = {
@@ -236,6 +268,13 @@ def _convert_api_to_frontend_format(api_response):
         
         # Get population comparison
         population_comparison = disease_data.get("population_comparison")
+        if not population_comparison and population_index is not None:
+            population_comparison = population_index.compare(
+                disease_key,
+                risk_score,
+                input_data.get("RIDAGEYR"),
+                input_data.get("RIAGENDR")
+            )
         
         diseases.append({
             "disease_name": disease_name,
@@ -250,6 +289,29 @@ def _convert_api_to_frontend_format(api_response):
     return {"diseases": diseases}
 
 
+@traced()
+def _find_similar_individuals(input_data, converted_response, k=25):
+    """
+    Summarize disease outcomes among the k most similar NHANES participants, keyed by disease name.
+
+    This is supplementary to the prediction, so any failure to load or query
+    the index yields no similar individuals instead of an error.
+    """
+    try:
+        index = load_similarity_index()
+        neighbors = index.query(input_data, k=k) if index is not None else None
+    except Exception:
+        return {}
+    if neighbors is None:
+        return {}
+    summary = summarize_outcomes(neighbors)
+    similar = {}
+    for disease in converted_response["diseases"]:
+        if disease["disease_type"] in summary:
+            similar[disease["disease_name"]] = dict(summary[disease["disease_type"]], neighbors=len(neighbors))
+    return similar
+
+
 def _format_feature_name(feature_code):
     """Convert feature code to readable name."""
     feature_name_map = {
@@ -303,6 +365,7 @@ def _format_feature_value(feature_code, value):
     return str(value)
 
 
+@profiled()
 def _draw_forms():
     create_basic_info_section()
     create_lifestyle_factors_section()        
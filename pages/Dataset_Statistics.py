@@ -1,13 +1,38 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from pathlib import Path
 import sys
 import os
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.aggregates import DatasetAggregate
+from utils.cohort_index import CohortIndex
+from utils.column_profile import merge_profiles, profile_table
+from utils.intervals import prevalence_intervals
+from utils.sampling import stratified_sample, stratum_codes
+from utils.weighted_stats import (
+    WEIGHT_COLUMN,
+    group_codes,
+    survey_weights,
+    weighted_mean,
+    weighted_proportion,
+    weighted_quantiles,
+    weighted_totals,
+)
+from utils.constants import AGE_GROUP_BINS, AGE_GROUP_LABELS, DISEASE_LABELS, GENDER_MAP, HEALTH_METRICS
+from utils.dataset_store import (
+    dataset_fingerprint,
+    ingest_csv,
+    list_cycles,
+    load_aggregate,
+    load_dataframe,
+    load_profile,
+    needs_ingest,
+    scan,
+)
 
 st.set_page_config(page_title="Dataset Statistics", layout="wide")
 
@@ -20,68 +45,409 @@ else:
 st.title("NHANES Dataset Statistics")
 st.markdown("---")
 
-# Dataset path (now in frontend folder)
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
-DATASET_PATH = PROJECT_ROOT / "data" / "nhanes_2021_2023_master.csv"
+cycles = list_cycles()
+if not cycles:
+    st.error("No NHANES dataset found. Expected files named like data/nhanes_2021_2023_master.csv.")
+    st.stop()
+
+# Filters are pushed down into the dataset reader
+with st.sidebar:
+    st.header("Dataset Filters")
+    selected_cycles = st.multiselect("Survey Cycles", list(cycles), default=list(cycles))
+    selected_genders = st.multiselect("Gender", list(GENDER_MAP.values()), default=list(GENDER_MAP.values()))
+    # NHANES top-codes age at 80
+    selected_ages = st.slider("Age Range", 0, 80, (0, 80))
+    use_weights = st.toggle(
+        "Apply survey weights",
+        help=f"Weight estimates by the NHANES exam weight ({WEIGHT_COLUMN}) so they describe the US population."
+    )
+    sample_charts = st.toggle(
+        "Sample row-level charts",
+        help="Draw histograms from a reproducible sample stratified by gender and age group. Tables stay exact."
+    )
+    chart_sample_size = st.number_input(
+        "Chart sample size", min_value=1000, max_value=1_000_000, value=10_000, step=1000, disabled=not sample_charts
+    )
+
+if not selected_cycles or not selected_genders:
+    st.warning("Select at least one survey cycle and gender.")
+    st.stop()
+
+gender_filter = None
+if len(selected_genders) < len(GENDER_MAP):
+    gender_filter = tuple(code for code, name in GENDER_MAP.items() if name in selected_genders)
+age_filter = None if selected_ages == (0, 80) else tuple(float(a) for a in selected_ages)
+filters_active = gender_filter is not None or age_filter is not None
+
+selected_partitions = [path for cycle in selected_cycles for path in cycles[cycle]]
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def load_filtered(partitions, age_range, genders, fingerprints):
+    """Scan the selected partitions with filters pushed down; `fingerprints` is only part of the cache key."""
+    return scan(age_range=age_range, genders=genders, partitions=partitions).to_pandas(split_blocks=True)
 
-@st.cache_data
 def load_dataset():
-    """Load the dataset with caching."""
+    """Load the selected cycles, as read-only views over the shared memory-mapped cache when unfiltered."""
     try:
-        df = pd.read_csv(DATASET_PATH, low_memory=False)
-        return df
+        if len(selected_partitions) == 1 and not filters_active:
+            return load_dataframe(selected_partitions[0])
+        fingerprints = tuple(dataset_fingerprint(path) for path in selected_partitions)
+        return load_filtered(tuple(selected_partitions), age_filter, gender_filter, fingerprints)
     except Exception as e:
         st.error(f"Error loading dataset: {e}")
         return None
 
-# Load dataset
-with st.spinner("Loading dataset..."):
-    df = load_dataset()
-
-if df is None:
-    st.error("Failed to load dataset. Please check the file path.")
-    st.stop()
-
 # Overall Statistics
 st.header("Overall Statistics")
 
-col1, col2, col3, col4 = st.columns(4)
+overview_slots = [col.empty() for col in st.columns(4)]
+
+def render_overview(overview):
+    """Render the overview metrics from a (possibly partial) OverviewAggregate."""
+    total_count = overview.rows
+    overview_slots[0].metric("Total Participants", f"{total_count:,}")
+
+    # Gender distribution
+    if overview.has_gender:
+        male_count = overview.gender_counts.get(1, 0)
+        female_count = overview.gender_counts.get(2, 0)
+        male_pct = (male_count/total_count*100) if total_count > 0 else 0
+        female_pct = (female_count/total_count*100) if total_count > 0 else 0
+        overview_slots[1].metric("Male", f"{male_count:,}", f"{male_pct:.1f}% of total")
+        overview_slots[2].metric("Female", f"{female_count:,}", f"{female_pct:.1f}% of total")
+    else:
+        overview_slots[1].metric("Male", "N/A")
+        overview_slots[2].metric("Female", "N/A")
+
+    # Age statistics
+    if overview.has_age and overview.age.count > 0:
+        overview_slots[3].metric("Average Age", f"{overview.age.mean:.1f} years")
+    else:
+        overview_slots[3].metric("Average Age", "N/A")
+
+# First visit after a partition's CSV changed or was added: stream only that
+# file in chunks, updating the overview as rows arrive. A partition that
+# fails to parse is reported and left out; the others are still shown
+ingested = DatasetAggregate()
+failed_partitions = []
+for csv_path in selected_partitions:
+    if not needs_ingest(csv_path):
+        continue
+    progress = st.progress(0.0, text=f"Reading {csv_path.name}...")
+
+    def _on_chunk(partial, fraction, csv_path=csv_path, progress=progress):
+        render_overview(DatasetAggregate().merge(ingested).merge(partial).overview)
+        progress.progress(fraction, text=f"Reading {csv_path.name}... {partial.rows:,} rows")
 
-total_count = len(df)
-col1.metric("Total Participants", f"{total_count:,}")
-
-# Gender distribution
-if 'RIAGENDR' in df.columns:
-    gender_counts = df['RIAGENDR'].value_counts()
-    male_count = gender_counts.get(1, 0)
-    female_count = gender_counts.get(2, 0)
-    male_pct = (male_count/total_count*100) if total_count > 0 else 0
-    female_pct = (female_count/total_count*100) if total_count > 0 else 0
-    col2.metric("Male", f"{male_count:,}", f"{male_pct:.1f}% of total")
-    col3.metric("Female", f"{female_count:,}", f"{female_pct:.1f}% of total")
-else:
-    col2.metric("Male", "N/A")
-    col3.metric("Female", "N/A")
+    try:
+        ingested.merge(ingest_csv(csv_path, on_chunk=_on_chunk))
+    except Exception as e:
+        st.error(f"Error loading {csv_path.name}: {e}")
+        failed_partitions.append(csv_path)
+    progress.empty()
+
+if failed_partitions:
+    selected_partitions = [path for path in selected_partitions if path not in failed_partitions]
+    selected_cycles = [cycle for cycle in selected_cycles if any(path in selected_partitions for path in cycles[cycle])]
+    if not selected_partitions:
+        st.stop()
+
+# Every cached section result is keyed by the data it was computed from, so a
+# section is only recomputed when a partition changes or the filters do
+dataset_key = (tuple(dataset_fingerprint(path) for path in selected_partitions), age_filter, gender_filter)
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def load_page_aggregate(dataset_key):
+    """
+    Aggregate for the current selection. Unfiltered figures are merged from
+    the persisted per-partition partials, so appending data costs time
+    proportional to the new rows only.
+    """
+    if filters_active:
+        df = load_dataset()
+        if df is None:
+            return None
+        return DatasetAggregate(HEALTH_METRICS.values()).update(df)
+    aggregate = DatasetAggregate()
+    for csv_path in selected_partitions:
+        aggregate.merge(load_aggregate(csv_path))
+    return aggregate
+
+aggregate = load_page_aggregate(dataset_key)
+if aggregate is None:
+    st.error("Failed to load dataset. Please check the file path.")
+    st.stop()
 
-# Age statistics
-if 'RIDAGEYR' in df.columns:
-    avg_age = df['RIDAGEYR'].mean()
-    col4.metric("Average Age", f"{avg_age:.1f} years")
-else:
-    col4.metric("Average Age", "N/A")
+render_overview(aggregate.overview)
 
 st.markdown("---")
 
-# Gender Distribution Chart
-st.header("Gender Distribution")
+# Section computations, cached per dataset key. Arguments with a leading
+# underscore are not hashed by Streamlit; `dataset_key` identifies them.
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def compute_age_section(dataset_key, _df):
+    """Age group counts and the age statistics table."""
+    age_df = _df[['RIDAGEYR']].dropna()
+    age_groups = pd.cut(age_df['RIDAGEYR'], bins=AGE_GROUP_BINS, labels=AGE_GROUP_LABELS)
+    age_group_counts = age_groups.value_counts().sort_index()
+    ages = age_df['RIDAGEYR']
+    return age_group_counts, age_stats_table(ages.mean(), ages.median(), ages.min(), ages.max(), ages.std())
+
+def age_stats_table(mean, median, minimum, maximum, std):
+    age_stats = {
+        'Statistic': ['Mean', 'Median', 'Min', 'Max', 'Std Dev'],
+        'Value': [
+            f"{mean:.1f} years",
+            f"{median:.1f} years",
+            f"{minimum:.0f} years",
+            f"{maximum:.0f} years",
+            f"{std:.1f} years"
+        ]
+    }
+    return pd.DataFrame(age_stats)
+
+def add_intervals(prevalence_df, cases_col, total_col):
+    """Add 95% CI bounds (in %) for every prevalence row, computed in one vectorized pass."""
+    if prevalence_df.empty:
+        return prevalence_df
+    low, high, method = prevalence_intervals(prevalence_df[cases_col], prevalence_df[total_col])
+    prevalence_df['CI Low (%)'] = low * 100
+    prevalence_df['CI High (%)'] = high * 100
+    prevalence_df['CI Method'] = method
+    return prevalence_df
+
+def format_interval(row, value_col):
+    return f"{row[value_col]:.2f} ({row['CI Low (%)']:.2f}–{row['CI High (%)']:.2f})"
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def compute_prevalence(dataset_key, _aggregate):
+    """Overall disease prevalence from the aggregate's tallies (valid responses only: 1=Yes, 2=No)."""
+    disease_stats = []
+    for disease_key, disease_info in DISEASE_LABELS.items():
+        if disease_key not in _aggregate.prevalence:
+            continue
+        disease_count, total = _aggregate.prevalence[disease_key]["all"]
+        if total > 0:
+            prevalence = (disease_count / total) * 100
+            disease_stats.append({
+                'Disease': disease_info['name'],
+                'Total Respondents': total,
+                'Cases': disease_count,
+                'Prevalence (raw)': prevalence
+            })
+    disease_df = add_intervals(pd.DataFrame(disease_stats), 'Cases', 'Total Respondents')
+    return format_prevalence_table(disease_df)
+
+def format_prevalence_table(disease_df):
+    if not disease_df.empty:
+        disease_df['Prevalence (%)'] = disease_df['Prevalence (raw)'].map(lambda value: f"{value:.2f}%")
+        disease_df['95% CI'] = disease_df.apply(
+            lambda row: f"{row['CI Low (%)']:.2f}%–{row['CI High (%)']:.2f}%", axis=1
+        )
+    return disease_df
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def compute_prevalence_by_group(dataset_key, _aggregate, group):
+    """Prevalence per disease and gender ("gender") or age group ("age_group")."""
+    if group == "gender":
+        group_column = 'Gender'
+        group_keys = [(str(code), name) for code, name in GENDER_MAP.items()]
+    else:
+        group_column = 'Age Group'
+        group_keys = [(label, label) for label in AGE_GROUP_LABELS]
+
+    rows = []
+    for disease_key, disease_info in DISEASE_LABELS.items():
+        if disease_key not in _aggregate.prevalence:
+            continue
+        tallies = _aggregate.prevalence[disease_key][group]
+        for key, label in group_keys:
+            cases, total = tallies.get(key, (0, 0))
+            if total > 0:
+                rows.append({
+                    'Disease': disease_info['name'],
+                    group_column: label,
+                    'Prevalence (%)': (cases / total) * 100,
+                    'Cases': cases,
+                    'Total': total
+                })
+    return add_intervals(pd.DataFrame(rows), 'Cases', 'Total')
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def compute_metric_summary(dataset_key, _aggregate):
+    """Health metric summaries from the aggregate's moments and quantile sketches."""
+    available_metrics = {}
+    for metric_name, col_name in HEALTH_METRICS.items():
+        summary = _aggregate.metrics.get(col_name)
+        if summary is not None and summary.moments.count > 0:
+            available_metrics[metric_name] = dict(summary.summary(), column=col_name)
+    return available_metrics
+
+@st.cache_data(show_spinner=False, max_entries=16, persist="disk")
+def compute_profile(dataset_key):
+    """
+    Per-column profile of the selection, persisted to disk under the dataset
+    key (partition fingerprints and filters) so it survives restarts until a
+    partition changes. Unfiltered profiles are merged from the persisted
+    per-partition profiles, so appending data only profiles the new rows.
+    """
+    if filters_active:
+        table = scan(age_range=age_filter, genders=gender_filter, partitions=selected_partitions)
+        profile = profile_table(table.drop_columns(['CYCLE']))
+    else:
+        profile = merge_profiles([load_profile(path) for path in selected_partitions])
+    profile_df = pd.DataFrame.from_dict(profile["columns"], orient="index").drop(columns=['values'])
+    return profile["rows"], profile_df
+
+# Survey-weighted counterparts of the computations above. Each one is a
+# handful of vectorized bincount/searchsorted passes over the selection.
+
+def age_group_codes(df):
+    groups = pd.cut(df['RIDAGEYR'], bins=AGE_GROUP_BINS, labels=False)
+    return np.nan_to_num(groups.to_numpy(dtype=float), nan=-1).astype(np.int64)
+
+def weighted_group_codes(df, group):
+    """Return (codes, labels) for "all", "gender" or "age_group"."""
+    if group == "gender":
+        return group_codes(df['RIAGENDR'], list(GENDER_MAP)), list(GENDER_MAP.values())
+    if group == "age_group":
+        return age_group_codes(df), list(AGE_GROUP_LABELS)
+    return np.zeros(len(df), dtype=np.int64), [None]
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def compute_weighted_gender(dataset_key, _df, n_cycles):
+    """Estimated population by gender."""
+    codes, labels = weighted_group_codes(_df, "gender")
+    totals = weighted_totals(survey_weights(_df, n_cycles), codes, len(labels))
+    return dict(zip(labels, totals))
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def compute_weighted_age_section(dataset_key, _df, n_cycles):
+    """Estimated population by age group and weighted age statistics."""
+    weights = survey_weights(_df, n_cycles)
+    totals = weighted_totals(weights, age_group_codes(_df), len(AGE_GROUP_LABELS))
+    ages = _df['RIDAGEYR'].to_numpy(dtype=float)
+    present = ages[(weights > 0) & ~np.isnan(ages)]
+    if present.size == 0:
+        return pd.Series(totals, index=AGE_GROUP_LABELS), pd.DataFrame(columns=['Statistic', 'Value'])
+    everyone = np.zeros(len(ages), dtype=np.int64)
+    mean, std, _ = weighted_mean(ages, weights, everyone, 1)
+    median = weighted_quantiles(ages, weights, everyone, 1, [0.5])[0, 0]
+    stats_df = age_stats_table(mean[0], median, present.min(), present.max(), std[0])
+    return pd.Series(totals, index=AGE_GROUP_LABELS), stats_df
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def compute_weighted_prevalence(dataset_key, _df, n_cycles, group):
+    """
+    Weighted prevalence overall ("all") or per gender or age group, in the
+    same layout as the unweighted tables. Intervals use Kish's effective
+    sample size; Cases and Total stay unweighted respondent counts.
+    """
+    weights = survey_weights(_df, n_cycles)
+    codes, labels = weighted_group_codes(_df, group)
+    group_column = {'gender': 'Gender', 'age_group': 'Age Group'}.get(group)
+
+    rows = []
+    for disease_key, disease_info in DISEASE_LABELS.items():
+        col_name = disease_info['col']
+        if col_name not in _df.columns:
+            continue
+        values = _df[col_name].to_numpy(dtype=float)
+        proportion, cases, respondents, effective_n = weighted_proportion(values, weights, codes, len(labels))
+        for idx, label in enumerate(labels):
+            if respondents[idx] == 0:
+                continue
+            row = {
+                'Disease': disease_info['name'],
+                'Prevalence (%)': proportion[idx] * 100,
+                'Cases': int(cases[idx]),
+                'Total': int(respondents[idx]),
+                'Effective N': int(round(effective_n[idx])),
+                'Effective Cases': int(round(proportion[idx] * effective_n[idx]))
+            }
+            if group_column:
+                row[group_column] = label
+            rows.append(row)
+
+    prevalence_df = add_intervals(pd.DataFrame(rows), 'Effective Cases', 'Effective N')
+    if group_column is None and not prevalence_df.empty:
+        prevalence_df = prevalence_df.rename(columns={'Total': 'Total Respondents', 'Prevalence (%)': 'Prevalence (raw)'})
+        prevalence_df = format_prevalence_table(prevalence_df)
+    return prevalence_df
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def compute_weighted_metric_summary(dataset_key, _df, n_cycles):
+    """Weighted health metric summaries, in the layout of compute_metric_summary."""
+    weights = survey_weights(_df, n_cycles)
+    everyone = np.zeros(len(_df), dtype=np.int64)
+    available_metrics = {}
+    for metric_name, col_name in HEALTH_METRICS.items():
+        if col_name not in _df.columns:
+            continue
+        values = _df[col_name].to_numpy(dtype=float)
+        present = values[(weights > 0) & ~np.isnan(values)]
+        if present.size == 0:
+            continue
+        mean, std, count = weighted_mean(values, weights, everyone, 1)
+        available_metrics[metric_name] = {
+            'mean': mean[0],
+            'median': weighted_quantiles(values, weights, everyone, 1, [0.5])[0, 0],
+            'std': std[0],
+            'min': present.min(),
+            'max': present.max(),
+            'count': int(count[0]),
+            'column': col_name
+        }
+    return available_metrics
+
+def weighted_histogram_args(chart_df, col_name, sampling_rate=1.0):
+    """Extra px.histogram arguments that make each bar the estimated population of its bin."""
+    if not weighted:
+        return {}
+    present = chart_df[col_name].notna().to_numpy()
+    # Sampled rows stand in for 1 / sampling_rate rows each
+    weights = survey_weights(chart_df, len(selected_cycles)) / sampling_rate
+    return {'y': weights[present], 'histfunc': 'sum'}
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def compute_chart_sample(dataset_key, _df, size):
+    """Row indices of a stratified (gender x age group) sample for row-level charts."""
+    return stratified_sample(stratum_codes(_df), size)
+
+def chart_rows(df):
+    """
+    Return (chart_df, sampling_rate, title_suffix) for visual-only charts.
+    Tables never use this; they come from exact aggregates.
+    """
+    if not sample_charts or len(df) <= chart_sample_size:
+        return df, 1.0, ""
+    rows = compute_chart_sample(dataset_key, df, int(chart_sample_size))
+    sampling_rate = len(rows) / len(df)
+    return df.iloc[rows], sampling_rate, f" (sample: {sampling_rate:.1%} of rows)"
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_cohort_index(dataset_key, _df):
+    """Bitmap indexes over the current selection; cohort widgets only intersect them."""
+    return CohortIndex(_df)
+
+def render_gender_section(df):
+    st.header("Gender Distribution")
+
+    if not aggregate.overview.has_gender:
+        st.warning("Gender data (RIAGENDR) not available in dataset.")
+        return
+
+    if weighted:
+        gender_counts_dict = compute_weighted_gender(dataset_key, df, len(selected_cycles))
+    else:
+        gender_labels = {1: "Male", 2: "Female"}
+        gender_counts_dict = {
+            gender_labels.get(k, k): v for k, v in sorted(aggregate.overview.gender_counts.items())
+        }
 
-if 'RIAGENDR' in df.columns:
-    gender_data = df['RIAGENDR'].value_counts().sort_index()
-    gender_labels = {1: "Male", 2: "Female"}
-    gender_counts_dict = {gender_labels.get(k, k): v for k, v in gender_data.items()}
-    
     col1, col2 = st.columns(2)
-    
+
     with col1:
         # Pie chart
         fig_pie = px.pie(
@@ -92,121 +458,82 @@ if 'RIAGENDR' in df.columns:
         )
         fig_pie.update_traces(textposition='inside', textinfo='percent+label')
         st.plotly_chart(fig_pie, use_container_width=True)
-    
+
     with col2:
         # Bar chart
         fig_bar = px.bar(
             x=list(gender_counts_dict.keys()),
             y=list(gender_counts_dict.values()),
             title="Gender Distribution (Bar Chart)",
-            labels={'x': 'Gender', 'y': 'Count'},
+            labels={'x': 'Gender', 'y': count_label},
             color=list(gender_counts_dict.keys()),
             color_discrete_map={"Male": "#3b82f6", "Female": "#ec4899"}
         )
         fig_bar.update_layout(showlegend=False)
         st.plotly_chart(fig_bar, use_container_width=True)
-else:
-    st.warning("Gender data (RIAGENDR) not available in dataset.")
 
-st.markdown("---")
+def render_age_section(df):
+    st.header("Age Distribution")
+
+    if 'RIDAGEYR' not in df.columns:
+        st.warning("Age data (RIDAGEYR) not available in dataset.")
+        return
 
-# Age Distribution
-st.header("Age Distribution")
+    if weighted:
+        age_group_counts, age_stats_df = compute_weighted_age_section(dataset_key, df, len(selected_cycles))
+    else:
+        age_group_counts, age_stats_df = compute_age_section(dataset_key, df)
+
+    chart_df, sampling_rate, sample_label = chart_rows(df)
 
-if 'RIDAGEYR' in df.columns:
-    age_df = df[df['RIDAGEYR'].notna()].copy()
-    
     col1, col2 = st.columns(2)
-    
+
     with col1:
         # Age histogram
         fig_hist = px.histogram(
-            age_df,
+            chart_df[['RIDAGEYR']].dropna(),
             x='RIDAGEYR',
             nbins=50,
-            title="Age Distribution (Histogram)",
+            title=f"Age Distribution (Histogram){sample_label}",
             labels={'RIDAGEYR': 'Age (years)', 'count': 'Number of Participants'},
-            color_discrete_sequence=['#3b82f6']
+            color_discrete_sequence=['#3b82f6'],
+            **weighted_histogram_args(chart_df, 'RIDAGEYR', sampling_rate)
         )
         fig_hist.update_layout(bargap=0.1)
+        if weighted:
+            fig_hist.update_layout(yaxis_title=count_label)
         st.plotly_chart(fig_hist, use_container_width=True)
-    
+
     with col2:
         # Age groups
-        age_df['Age Group'] = pd.cut(
-            age_df['RIDAGEYR'],
-            bins=[0, 20, 30, 40, 50, 60, 70, 80, 200],
-            labels=['0-20', '20-30', '30-40', '40-50', '50-60', '60-70', '70-80', '80+']
-        )
-        age_group_counts = age_df['Age Group'].value_counts().sort_index()
-        
         fig_age_group = px.bar(
             x=age_group_counts.index.astype(str),
             y=age_group_counts.values,
             title="Age Group Distribution",
-            labels={'x': 'Age Group', 'y': 'Count'},
+            labels={'x': 'Age Group', 'y': count_label},
             color=age_group_counts.values,
             color_continuous_scale='Blues'
         )
         fig_age_group.update_layout(showlegend=False)
         st.plotly_chart(fig_age_group, use_container_width=True)
-    
+
     # Age statistics table
     st.subheader("Age Statistics")
-    age_stats = {
-        'Statistic': ['Mean', 'Median', 'Min', 'Max', 'Std Dev'],
-        'Value': [
-            f"{age_df['RIDAGEYR'].mean():.1f} years",
-            f"{age_df['RIDAGEYR'].median():.1f} years",
-            f"{age_df['RIDAGEYR'].min():.0f} years",
-            f"{age_df['RIDAGEYR'].max():.0f} years",
-            f"{age_df['RIDAGEYR'].std():.1f} years"
-        ]
-    }
-    st.dataframe(pd.DataFrame(age_stats), use_container_width=True, hide_index=True)
-else:
-    st.warning("Age data (RIDAGEYR) not available in dataset.")
+    st.dataframe(age_stats_df, use_container_width=True, hide_index=True)
 
-st.markdown("---")
+def render_prevalence_section(df):
+    st.header("Disease Prevalence")
 
-# Disease Prevalence
-st.header("Disease Prevalence")
+    if weighted:
+        disease_df = compute_weighted_prevalence(dataset_key, df, len(selected_cycles), "all")
+    else:
+        disease_df = compute_prevalence(dataset_key, aggregate)
+    if disease_df.empty:
+        st.warning("No disease data available in dataset.")
+        return
 
-# Disease labels mapping
-disease_labels = {
-    'diabetes': {'col': 'DIQ010', 'name': 'Diabetes'},
-    'hypertension': {'col': 'BPQ020', 'name': 'Hypertension'},
-    'cvd': {'col': 'MCQ160B', 'name': 'Cardiovascular Disease'},
-    'ckd': {'col': 'MCQ220', 'name': 'Chronic Kidney Disease'}
-}
-
-disease_stats = []
-
-for disease_key, disease_info in disease_labels.items():
-    col_name = disease_info['col']
-    disease_name = disease_info['name']
-    
-    if col_name in df.columns:
-        # Filter valid responses (1=Yes, 2=No)
-        valid_data = df[df[col_name].isin([1, 2])]
-        if len(valid_data) > 0:
-            total = len(valid_data)
-            disease_count = len(valid_data[valid_data[col_name] == 1])
-            prevalence = (disease_count / total) * 100
-            
-            disease_stats.append({
-                'Disease': disease_name,
-                'Total Respondents': total,
-                'Cases': disease_count,
-                'Prevalence (%)': f"{prevalence:.2f}%",
-                'Prevalence (raw)': prevalence
-            })
-
-if disease_stats:
-    disease_df = pd.DataFrame(disease_stats)
-    
     col1, col2 = st.columns(2)
-    
+
     with col1:
         # Disease prevalence bar chart
         fig_disease = px.bar(
@@ -216,11 +543,13 @@ if disease_stats:
             title="Disease Prevalence (%)",
             labels={'Prevalence (raw)': 'Prevalence (%)', 'Disease': 'Disease'},
             color='Prevalence (raw)',
-            color_continuous_scale='Reds'
+            color_continuous_scale='Reds',
+            error_y=disease_df['CI High (%)'] - disease_df['Prevalence (raw)'],
+            error_y_minus=disease_df['Prevalence (raw)'] - disease_df['CI Low (%)']
         )
         fig_disease.update_layout(showlegend=False, yaxis_title="Prevalence (%)")
         st.plotly_chart(fig_disease, use_container_width=True)
-    
+
     with col2:
         # Disease cases count
         fig_cases = px.bar(
@@ -234,192 +563,135 @@ if disease_stats:
         )
         fig_cases.update_layout(showlegend=False)
         st.plotly_chart(fig_cases, use_container_width=True)
-    
+
     # Disease statistics table
     st.subheader("Disease Statistics Table")
-    display_df = disease_df[['Disease', 'Total Respondents', 'Cases', 'Prevalence (%)']].copy()
+    display_df = disease_df[['Disease', 'Total Respondents', 'Cases', 'Prevalence (%)', '95% CI']].copy()
     st.dataframe(display_df, use_container_width=True, hide_index=True)
-else:
-    st.warning("No disease data available in dataset.")
-
-st.markdown("---")
 
-# Disease by Gender
-st.header("Disease Prevalence by Gender")
-
-if 'RIAGENDR' in df.columns:
-    disease_by_gender = []
-    
-    for disease_key, disease_info in disease_labels.items():
-        col_name = disease_info['col']
-        disease_name = disease_info['name']
-        
-        if col_name in df.columns:
-            for gender_code, gender_name in [(1, 'Male'), (2, 'Female')]:
-                gender_data = df[(df['RIAGENDR'] == gender_code) & (df[col_name].isin([1, 2]))]
-                if len(gender_data) > 0:
-                    total = len(gender_data)
-                    cases = len(gender_data[gender_data[col_name] == 1])
-                    prevalence = (cases / total) * 100
-                    
-                    disease_by_gender.append({
-                        'Disease': disease_name,
-                        'Gender': gender_name,
-                        'Prevalence (%)': prevalence,
-                        'Cases': cases,
-                        'Total': total
-                    })
-    
-    if disease_by_gender:
-        gender_disease_df = pd.DataFrame(disease_by_gender)
-        
-        # Grouped bar chart
-        fig_grouped = px.bar(
-            gender_disease_df,
-            x='Disease',
-            y='Prevalence (%)',
-            color='Gender',
-            title="Disease Prevalence by Gender",
-            barmode='group',
-            color_discrete_map={'Male': '#3b82f6', 'Female': '#ec4899'},
-            labels={'Prevalence (%)': 'Prevalence (%)', 'Disease': 'Disease'}
-        )
-        st.plotly_chart(fig_grouped, use_container_width=True)
-        
-        # Table
-        st.subheader("Disease Prevalence by Gender (Table)")
-        pivot_df = gender_disease_df.pivot(index='Disease', columns='Gender', values='Prevalence (%)')
-        pivot_df = pivot_df.round(2)
-        pivot_df.columns.name = None
-        pivot_df.index.name = None
-        st.dataframe(pivot_df, use_container_width=True)
-else:
-    st.warning("Gender data not available for disease analysis.")
-
-st.markdown("---")
+def render_prevalence_by_gender_section(df):
+    st.header("Disease Prevalence by Gender")
+
+    if not aggregate.overview.has_gender:
+        st.warning("Gender data not available for disease analysis.")
+        return
+
+    if weighted:
+        gender_disease_df = compute_weighted_prevalence(dataset_key, df, len(selected_cycles), "gender")
+    else:
+        gender_disease_df = compute_prevalence_by_group(dataset_key, aggregate, "gender")
+    if gender_disease_df.empty:
+        return
+
+    # Grouped bar chart
+    fig_grouped = px.bar(
+        gender_disease_df,
+        x='Disease',
+        y='Prevalence (%)',
+        color='Gender',
+        title="Disease Prevalence by Gender",
+        barmode='group',
+        color_discrete_map={'Male': '#3b82f6', 'Female': '#ec4899'},
+        labels={'Prevalence (%)': 'Prevalence (%)', 'Disease': 'Disease'},
+        error_y=gender_disease_df['CI High (%)'] - gender_disease_df['Prevalence (%)'],
+        error_y_minus=gender_disease_df['Prevalence (%)'] - gender_disease_df['CI Low (%)']
+    )
+    st.plotly_chart(fig_grouped, use_container_width=True)
 
-# Disease by Age Group
-st.header("Disease Prevalence by Age Group")
-
-if 'RIDAGEYR' in df.columns:
-    age_disease_data = []
-    
-    # Create age groups
-    df_age = df[df['RIDAGEYR'].notna()].copy()
-    df_age['Age Group'] = pd.cut(
-        df_age['RIDAGEYR'],
-        bins=[0, 20, 30, 40, 50, 60, 70, 80, 200],
-        labels=['0-20', '20-30', '30-40', '40-50', '50-60', '60-70', '70-80', '80+']
+    # Table
+    st.subheader("Disease Prevalence by Gender (Table)")
+    st.caption("Prevalence (%) with 95% confidence interval")
+    gender_disease_df = gender_disease_df.assign(
+        Interval=gender_disease_df.apply(format_interval, axis=1, value_col='Prevalence (%)')
     )
-    
-    for disease_key, disease_info in disease_labels.items():
-        col_name = disease_info['col']
-        disease_name = disease_info['name']
-        
-        if col_name in df_age.columns:
-            for age_group in df_age['Age Group'].cat.categories:
-                age_data = df_age[
-                    (df_age['Age Group'] == age_group) & 
-                    (df_age[col_name].isin([1, 2]))
-                ]
-                if len(age_data) > 0:
-                    total = len(age_data)
-                    cases = len(age_data[age_data[col_name] == 1])
-                    prevalence = (cases / total) * 100
-                    
-                    age_disease_data.append({
-                        'Disease': disease_name,
-                        'Age Group': str(age_group),
-                        'Prevalence (%)': prevalence,
-                        'Cases': cases,
-                        'Total': total
-                    })
-    
-    if age_disease_data:
-        age_disease_df = pd.DataFrame(age_disease_data)
-        
-        # Line chart for each disease
-        diseases_list = age_disease_df['Disease'].unique()
-        
-        if len(diseases_list) > 0:
-            fig_line = go.Figure()
-            
-            colors = px.colors.qualitative.Set3
-            for i, disease in enumerate(diseases_list):
-                disease_data = age_disease_df[age_disease_df['Disease'] == disease].sort_values('Age Group')
-                fig_line.add_trace(go.Scatter(
-                    x=disease_data['Age Group'],
-                    y=disease_data['Prevalence (%)'],
-                    mode='lines+markers',
-                    name=disease,
-                    line=dict(width=3),
-                    marker=dict(size=8)
-                ))
-            
-            fig_line.update_layout(
-                title="Disease Prevalence by Age Group",
-                xaxis_title="Age Group",
-                yaxis_title="Prevalence (%)",
-                hovermode='x unified',
-                height=500
-            )
-            st.plotly_chart(fig_line, use_container_width=True)
-            
-            # Heatmap
-            st.subheader("Disease Prevalence Heatmap by Age Group")
-            pivot_age = age_disease_df.pivot(index='Disease', columns='Age Group', values='Prevalence (%)')
-            pivot_age = pivot_age.round(2)
-            pivot_age.columns.name = None
-            pivot_age.index.name = None
-            
-            fig_heatmap = px.imshow(
-                pivot_age,
-                labels=dict(x="Age Group", y="Disease", color="Prevalence (%)"),
-                title="Disease Prevalence Heatmap",
-                color_continuous_scale='Reds',
-                aspect="auto"
+    pivot_df = gender_disease_df.pivot(index='Disease', columns='Gender', values='Interval')
+    pivot_df.columns.name = None
+    pivot_df.index.name = None
+    st.dataframe(pivot_df, use_container_width=True)
+
+def render_prevalence_by_age_section(df):
+    st.header("Disease Prevalence by Age Group")
+
+    if not aggregate.overview.has_age:
+        st.warning("Age data not available for disease analysis.")
+        return
+
+    if weighted:
+        age_disease_df = compute_weighted_prevalence(dataset_key, df, len(selected_cycles), "age_group")
+    else:
+        age_disease_df = compute_prevalence_by_group(dataset_key, aggregate, "age_group")
+    if age_disease_df.empty:
+        return
+
+    # Line chart for each disease
+    diseases_list = age_disease_df['Disease'].unique()
+
+    fig_line = go.Figure()
+
+    for disease in diseases_list:
+        disease_data = age_disease_df[age_disease_df['Disease'] == disease].sort_values('Age Group')
+        fig_line.add_trace(go.Scatter(
+            x=disease_data['Age Group'],
+            y=disease_data['Prevalence (%)'],
+            mode='lines+markers',
+            name=disease,
+            line=dict(width=3),
+            marker=dict(size=8),
+            error_y=dict(
+                type='data',
+                symmetric=False,
+                array=disease_data['CI High (%)'] - disease_data['Prevalence (%)'],
+                arrayminus=disease_data['Prevalence (%)'] - disease_data['CI Low (%)']
             )
-            st.plotly_chart(fig_heatmap, use_container_width=True)
-            
-            # Table
-            st.subheader("Disease Prevalence by Age Group (Table)")
-            st.dataframe(pivot_age, use_container_width=True)
-else:
-    st.warning("Age data not available for disease analysis.")
-
-st.markdown("---")
-
-# Additional Health Metrics
-st.header("Additional Health Metrics")
-
-health_metrics = {
-    'BMI': 'BMXBMI',
-    'Waist Circumference': 'BMXWAIST',
-    'Systolic BP': 'BPXSY1',
-    'Diastolic BP': 'BPXDI1',
-    'HbA1c': 'LBXGH',
-    'Total Cholesterol': 'LBXTC',
-    'HDL Cholesterol': 'LBDHDD',
-    'LDL Cholesterol': 'LBDLDL',
-    'Triglycerides': 'LBXSTR'
-}
+        ))
+
+    fig_line.update_layout(
+        title="Disease Prevalence by Age Group",
+        xaxis_title="Age Group",
+        yaxis_title="Prevalence (%)",
+        hovermode='x unified',
+        height=500
+    )
+    st.plotly_chart(fig_line, use_container_width=True)
+
+    # Heatmap
+    st.subheader("Disease Prevalence Heatmap by Age Group")
+    pivot_age = age_disease_df.pivot(index='Disease', columns='Age Group', values='Prevalence (%)')
+    pivot_age = pivot_age.round(2)
+    pivot_age.columns.name = None
+    pivot_age.index.name = None
+
+    fig_heatmap = px.imshow(
+        pivot_age,
+        labels=dict(x="Age Group", y="Disease", color="Prevalence (%)"),
+        title="Disease Prevalence Heatmap",
+        color_continuous_scale='Reds',
+        aspect="auto"
+    )
+    st.plotly_chart(fig_heatmap, use_container_width=True)
 
-available_metrics = {}
-for metric_name, col_name in health_metrics.items():
-    if col_name in df.columns:
-        metric_data = df[df[col_name].notna()][col_name]
-        if len(metric_data) > 0:
-            available_metrics[metric_name] = {
-                'column': col_name,
-                'mean': metric_data.mean(),
-                'median': metric_data.median(),
-                'std': metric_data.std(),
-                'min': metric_data.min(),
-                'max': metric_data.max(),
-                'count': len(metric_data)
-            }
+    # Table
+    st.subheader("Disease Prevalence by Age Group (Table)")
+    st.caption("Prevalence (%) with 95% confidence interval; wide intervals mark small age groups")
+    age_disease_df = age_disease_df.assign(
+        Interval=age_disease_df.apply(format_interval, axis=1, value_col='Prevalence (%)')
+    )
+    pivot_interval = age_disease_df.pivot(index='Disease', columns='Age Group', values='Interval')
+    pivot_interval.columns.name = None
+    pivot_interval.index.name = None
+    st.dataframe(pivot_interval, use_container_width=True)
+
+def render_health_metrics_section(df):
+    st.header("Additional Health Metrics")
+
+    if weighted:
+        available_metrics = compute_weighted_metric_summary(dataset_key, df, len(selected_cycles))
+    else:
+        available_metrics = compute_metric_summary(dataset_key, aggregate)
+    if not available_metrics:
+        st.warning("No additional health metrics available in dataset.")
+        return
 
-if available_metrics:
     # Summary table
     metrics_summary = []
     for metric_name, stats in available_metrics.items():
@@ -432,71 +704,204 @@ if available_metrics:
             'Max': f"{stats['max']:.2f}",
             'Sample Size': stats['count']
         })
-    
+
     st.subheader("Health Metrics Summary")
     st.dataframe(pd.DataFrame(metrics_summary), use_container_width=True, hide_index=True)
-    
+
     # Distribution charts for top metrics
     st.subheader("Distribution of Key Health Metrics")
-    
+
     top_metrics = ['BMI', 'Systolic BP', 'HbA1c', 'Total Cholesterol']
     available_top = [m for m in top_metrics if m in available_metrics]
-    
+
     if available_top:
+        chart_df, sampling_rate, sample_label = chart_rows(df)
         cols = st.columns(min(len(available_top), 2))
         for idx, metric_name in enumerate(available_top[:4]):
             col_idx = idx % 2
             with cols[col_idx]:
                 col_name = available_metrics[metric_name]['column']
-                metric_data = df[df[col_name].notna()][col_name]
-                
+                metric_data = chart_df[col_name].dropna()
+
                 fig_dist = px.histogram(
-                    metric_data,
+                    x=metric_data,
                     nbins=30,
-                    title=f"{metric_name} Distribution",
-                    labels={'value': metric_name, 'count': 'Frequency'},
-                    color_discrete_sequence=['#3b82f6']
+                    title=f"{metric_name} Distribution{sample_label}",
+                    labels={'x': metric_name, 'count': 'Frequency'},
+                    color_discrete_sequence=['#3b82f6'],
+                    **weighted_histogram_args(chart_df, col_name, sampling_rate)
                 )
                 fig_dist.update_layout(bargap=0.1, showlegend=False)
+                if weighted:
+                    fig_dist.update_layout(yaxis_title=count_label)
                 st.plotly_chart(fig_dist, use_container_width=True)
-else:
-    st.warning("No additional health metrics available in dataset.")
 
-st.markdown("---")
+def format_profile_value(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ''
+    return f"{value:.6g}" if isinstance(value, float) else str(value)
+
+def render_dataset_information_section(df):
+    st.header("Dataset Information")
+
+    total_rows, profile_df = compute_profile(dataset_key)
+
+    info_col1, info_col2 = st.columns(2)
+
+    with info_col1:
+        st.subheader("Dataset Details")
+        st.write(f"**Total Records:** {total_rows:,}")
+        st.write(f"**Total Columns:** {len(profile_df)}")
+        st.write(f"**Memory Usage:** {profile_df['memory_bytes'].sum() / 1024**2:.2f} MB")
+
+    with info_col2:
+        st.subheader("Data Quality")
+        total_cells = total_rows * len(profile_df)
+        missing_cells = int(profile_df['missing'].sum())
+        completeness = ((total_cells - missing_cells) / total_cells) * 100 if total_cells > 0 else 0
+
+        st.write(f"**Total Cells:** {total_cells:,}")
+        st.write(f"**Missing Cells:** {missing_cells:,}")
+        st.write(f"**Data Completeness:** {completeness:.2f}%")
+
+        # Top columns with missing data
+        missing_data = profile_df['missing'].sort_values(ascending=False).head(10)
+        if len(missing_data[missing_data > 0]) > 0:
+            st.write("\n**Top 10 Columns with Missing Data:**")
+            missing_df = pd.DataFrame({
+                'Column': missing_data.index,
+                'Missing Count': missing_data.values,
+                'Missing %': (missing_data.values / total_rows * 100).round(2)
+            })
+            st.dataframe(missing_df, use_container_width=True, hide_index=True)
+
+    # Per-column drill-down
+    st.subheader("Column Profile")
+    drilldown_df = pd.DataFrame({
+        'Column': profile_df.index,
+        'Type': profile_df['dtype'].values,
+        'Missing': profile_df['missing'].values,
+        'Missing %': (profile_df['missing'].values / max(total_rows, 1) * 100).round(2),
+        # Counts merged from partitions with many distinct values are lower bounds
+        'Distinct': [f"{count:,}" if exact else f"≥ {count:,}"
+                     for count, exact in zip(profile_df['distinct'], profile_df['distinct_exact'])],
+        'Min': profile_df['min'].map(format_profile_value).values,
+        'Max': profile_df['max'].map(format_profile_value).values,
+        'Memory (KB)': (profile_df['memory_bytes'].values / 1024).round(1)
+    })
+    st.dataframe(drilldown_df, use_container_width=True, hide_index=True)
+
+def render_cohort_section(df):
+    st.header("Cohort Explorer")
+
+    cohort_index = load_cohort_index(dataset_key, df)
+    if not cohort_index.diseases:
+        st.warning("No disease data available in dataset.")
+        return
+
+    options = cohort_index.options()
+    selection = {}
+    cols = st.columns(max(len(options), 1))
+    for col, (dimension, labels) in zip(cols, options.items()):
+        with col:
+            selection[dimension] = st.multiselect(dimension, labels, key=f"cohort_{dimension}")
+    disease_names = {DISEASE_LABELS[key]['name']: key for key in cohort_index.diseases}
+    diagnosed = st.multiselect("Diagnosed with", list(disease_names), key="cohort_diagnosed")
+
+    bits = cohort_index.select(selection, [disease_names[name] for name in diagnosed])
+    cohort_size = cohort_index.count(bits)
+    share = (cohort_size / cohort_index.rows * 100) if cohort_index.rows > 0 else 0
+    st.metric("Cohort Size", f"{cohort_size:,}", f"{share:.1f}% of selected participants")
+    if cohort_size == 0:
+        st.info("No participants match this cohort.")
+        return
+
+    everyone = cohort_index.prevalence(cohort_index.select())
+    rows = []
+    for disease_key, (cases, total) in cohort_index.prevalence(bits).items():
+        all_cases, all_total = everyone[disease_key]
+        for group, group_cases, group_total in (("Cohort", cases, total), ("All Selected", all_cases, all_total)):
+            if group_total > 0:
+                rows.append({
+                    'Disease': DISEASE_LABELS[disease_key]['name'],
+                    'Group': group,
+                    'Prevalence (%)': (group_cases / group_total) * 100,
+                    'Cases': group_cases,
+                    'Total': group_total
+                })
+    if rows:
+        cohort_df = pd.DataFrame(rows)
+        fig_cohort = px.bar(
+            cohort_df,
+            x='Disease',
+            y='Prevalence (%)',
+            color='Group',
+            title="Disease Prevalence: Cohort vs. All Selected",
+            barmode='group',
+            color_discrete_map={'Cohort': '#ef4444', 'All Selected': '#94a3b8'}
+        )
+        st.plotly_chart(fig_cohort, use_container_width=True)
 
-# Dataset Information
-st.header("Dataset Information")
-
-info_col1, info_col2 = st.columns(2)
-
-with info_col1:
-    st.subheader("Dataset Details")
-    st.write(f"**Total Records:** {len(df):,}")
-    st.write(f"**Total Columns:** {len(df.columns)}")
-    st.write(f"**Memory Usage:** {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
-
-with info_col2:
-    st.subheader("Data Quality")
-    total_cells = len(df) * len(df.columns)
-    missing_cells = df.isnull().sum().sum()
-    completeness = ((total_cells - missing_cells) / total_cells) * 100
-    
-    st.write(f"**Total Cells:** {total_cells:,}")
-    st.write(f"**Missing Cells:** {missing_cells:,}")
-    st.write(f"**Data Completeness:** {completeness:.2f}%")
-    
-    # Top columns with missing data
-    missing_data = df.isnull().sum().sort_values(ascending=False).head(10)
-    if len(missing_data[missing_data > 0]) > 0:
-        st.write("\n**Top 10 Columns with Missing Data:**")
-        missing_df = pd.DataFrame({
-            'Column': missing_data.index,
-            'Missing Count': missing_data.values,
-            'Missing %': (missing_data.values / len(df) * 100).round(2)
-        })
-        st.dataframe(missing_df, use_container_width=True, hide_index=True)
+        pivot_cohort = cohort_df.pivot(index='Disease', columns='Group', values='Prevalence (%)').round(2)
+        pivot_cohort.columns.name = None
+        pivot_cohort.index.name = None
+        st.dataframe(pivot_cohort, use_container_width=True)
+
+    # Health metrics for the cohort, read through the unpacked row mask
+    mask = cohort_index.to_mask(bits)
+    metrics_summary = []
+    for metric_name, col_name in HEALTH_METRICS.items():
+        if col_name not in df.columns:
+            continue
+        values = df[col_name].to_numpy(dtype=float)[mask]
+        values = values[~np.isnan(values)]
+        if len(values) > 0:
+            metrics_summary.append({
+                'Metric': metric_name,
+                'Mean': f"{values.mean():.2f}",
+                'Median': f"{np.median(values):.2f}",
+                'Sample Size': len(values)
+            })
+    if metrics_summary:
+        st.subheader("Cohort Health Metrics")
+        st.dataframe(pd.DataFrame(metrics_summary), use_container_width=True, hide_index=True)
+
+# Only the opened section is computed and rendered on a rerun; sections that
+# need row-level data load it on demand
+SECTIONS = {
+    "Gender": (render_gender_section, False),
+    "Age": (render_age_section, True),
+    "Disease Prevalence": (render_prevalence_section, False),
+    "Prevalence by Gender": (render_prevalence_by_gender_section, False),
+    "Prevalence by Age Group": (render_prevalence_by_age_section, False),
+    "Health Metrics": (render_health_metrics_section, True),
+    "Dataset Information": (render_dataset_information_section, False),
+    "Cohort Explorer": (render_cohort_section, True),
+}
+
+section = st.radio("Section", list(SECTIONS), horizontal=True, key="dataset_section")
+render_section, needs_rows = SECTIONS[section]
+
+# Weighted estimates are computed from the rows, so every section needs them
+df = None
+weighted = False
+if needs_rows or use_weights:
+    with st.spinner("Loading dataset..."):
+        df = load_dataset()
+    if df is None:
+        st.error("Failed to load dataset. Please check the file path.")
+        st.stop()
+    if use_weights:
+        weighted = WEIGHT_COLUMN in df.columns
+        if weighted:
+            st.caption(f"Estimates are weighted by {WEIGHT_COLUMN} and describe the US population; "
+                       "case and respondent counts are unweighted.")
+        else:
+            st.warning(f"Survey weights ({WEIGHT_COLUMN}) not available in dataset; showing unweighted figures.")
+count_label = 'Estimated Population' if weighted else 'Count'
+
+render_section(df)
 
 st.markdown("---")
 st.markdown("### Note")
-st.info("This page displays statistics from the NHANES 2021-2023 dataset. All disease prevalence calculations are based on self-reported data where available (1=Yes, 2=No).")
-
+st.info(f"This page displays statistics from the NHANES {', '.join(selected_cycles)} dataset. All disease prevalence calculations are based on self-reported data where available (1=Yes, 2=No).")
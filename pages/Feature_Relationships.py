@@ -0,0 +1,139 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.constants import GENDER_MAP, HEALTH_METRICS
+from utils.correlation import downsample_points, pairwise_correlation
+from utils.dataset_store import dataset_fingerprint, list_cycles, scan
+
+st.set_page_config(page_title="Feature Relationships", layout="wide")
+
+# Update last visited page to track page navigation
+if 'last_visited_page' not in st.session_state:
+    st.session_state.last_visited_page = 'feature_relationships'
+else:
+    st.session_state.last_visited_page = 'feature_relationships'
+
+st.title("NHANES Feature Relationships")
+st.markdown("---")
+
+cycles = list_cycles()
+if not cycles:
+    st.error("No NHANES dataset found. Expected files named like data/nhanes_2021_2023_master.csv.")
+    st.stop()
+
+with st.sidebar:
+    st.header("Dataset Filters")
+    selected_cycles = st.multiselect("Survey Cycles", list(cycles), default=list(cycles))
+
+if not selected_cycles:
+    st.warning("Select at least one survey cycle.")
+    st.stop()
+
+fingerprints = tuple(dataset_fingerprint(path) for cycle in selected_cycles for path in cycles[cycle])
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def load_metrics(cycle_keys, fingerprints):
+    """Read only the health metric columns (plus gender) of the selected cycles; `fingerprints` is only part of the cache key."""
+    columns = list(HEALTH_METRICS.values()) + ['RIAGENDR']
+    return scan(list(cycle_keys), columns=columns).to_pandas(split_blocks=True)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def compute_correlations(cycle_keys, fingerprints):
+    """Pairwise-complete correlation and pair counts for the available health metrics."""
+    df = load_metrics(cycle_keys, fingerprints)
+    available = {name: col for name, col in HEALTH_METRICS.items() if col in df.columns}
+    corr, counts = pairwise_correlation(df[list(available.values())].to_numpy(dtype=np.float64))
+    names = list(available)
+    return pd.DataFrame(corr, index=names, columns=names), pd.DataFrame(counts, index=names, columns=names)
+
+with st.spinner("Loading dataset..."):
+    df = load_metrics(tuple(selected_cycles), fingerprints)
+    corr_df, counts_df = compute_correlations(tuple(selected_cycles), fingerprints)
+
+if corr_df.empty:
+    st.warning("No health metrics available in dataset.")
+    st.stop()
+
+# Correlation matrix
+st.header("Correlation Matrix")
+fig_corr = px.imshow(
+    corr_df.round(2),
+    text_auto=True,
+    zmin=-1,
+    zmax=1,
+    color_continuous_scale='RdBu_r',
+    title="Pearson Correlation Between Health Metrics",
+    aspect="auto"
+)
+fig_corr.update_layout(height=600)
+st.plotly_chart(fig_corr, use_container_width=True)
+st.caption("Each pair uses every participant with both values recorded.")
+
+st.markdown("---")
+
+# Scatter explorer
+st.header("Scatter Explorer")
+
+metric_names = list(corr_df.columns)
+col1, col2, col3 = st.columns(3)
+with col1:
+    x_metric = st.selectbox("X Axis", metric_names, index=0)
+with col2:
+    y_metric = st.selectbox("Y Axis", metric_names, index=min(1, len(metric_names) - 1))
+with col3:
+    max_points = st.select_slider("Max Points", options=[1000, 2500, 5000, 10000, 25000], value=5000)
+
+x_col = HEALTH_METRICS[x_metric]
+y_col = HEALTH_METRICS[y_metric]
+x_values = df[x_col].to_numpy(dtype=np.float64)
+y_values = df[y_col].to_numpy(dtype=np.float64)
+
+# Thin the points on the server so the browser only receives what it can draw
+rows = downsample_points(x_values, y_values, max_points=max_points)
+pair_count = int(counts_df.loc[x_metric, y_metric])
+
+fig_scatter = go.Figure()
+genders = df['RIAGENDR'].to_numpy(dtype=np.float64) if 'RIAGENDR' in df.columns else None
+gender_colors = {1: '#3b82f6', 2: '#ec4899'}
+if genders is not None:
+    for code, name in GENDER_MAP.items():
+        group = rows[genders[rows] == code]
+        fig_scatter.add_trace(go.Scattergl(
+            x=x_values[group],
+            y=y_values[group],
+            mode='markers',
+            name=name,
+            marker=dict(size=4, opacity=0.5, color=gender_colors.get(code))
+        ))
+else:
+    fig_scatter.add_trace(go.Scattergl(
+        x=x_values[rows],
+        y=y_values[rows],
+        mode='markers',
+        marker=dict(size=4, opacity=0.5, color='#3b82f6')
+    ))
+
+fig_scatter.update_layout(
+    title=f"{y_metric} vs. {x_metric}",
+    xaxis_title=x_metric,
+    yaxis_title=y_metric,
+    height=550
+)
+st.plotly_chart(fig_scatter, use_container_width=True)
+
+col1, col2 = st.columns(2)
+col1.metric("Correlation (r)", f"{corr_df.loc[x_metric, y_metric]:.3f}")
+col2.metric("Participants With Both Values", f"{pair_count:,}")
+if len(rows) < pair_count:
+    st.caption(f"Showing {len(rows):,} of {pair_count:,} points, thinned to one per grid cell and then sampled.")
+
+st.markdown("---")
+st.markdown("### Note")
+st.info(f"Relationships are computed from the NHANES {', '.join(selected_cycles)} dataset. Correlation does not imply causation.")
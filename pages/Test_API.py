@@ -2,14 +2,27 @@ import streamlit as st
 import requests
 import os
 import sys
+import json
+import time
+
+import plotly.express as px
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from input.input_form import _convert_api_to_frontend_format
+from input.input_form import _convert_api_to_frontend_format, _find_similar_individuals
+from utils.admission import BackendBusy
+from utils.api_client import PREDICT_ALL_URL, predict_all
+from utils.backend_benchmark import run_benchmark, summarize
 from utils.display import convert_api_response_to_display_format, display_results
+from utils.metrics import CONVERSION_LATENCY, SUBMIT_LATENCY
+from utils.patient_fixtures import PATIENT_FIXTURES
+from utils.profiling import render_profile_panel, start_run
+from utils.synthetic_responses import generate_prediction_response
 
 st.set_page_config(page_title="API Test", layout="wide")
 
+start_run('test_api')
+
 # Update last visited page to track page navigation
 if 'last_visited_page' not in st.session_state:
     st.session_state.last_visited_page = 'test_api'
@@ -19,6 +32,153 @@ else:
 st.title("🧪 API Test Page")
 st.markdown("This page tests the backend API with fixed test data.")
 
+BACKEND_MODE = "Backend request"
+SYNTHETIC_MODE = "Synthetic response"
+LOAD_TEST_MODE = "Load test"
+
+
+def store_results(display_data, similar_individuals):
+    """Store converted results in session state as this page's results."""
+    st.session_state.prediction_done = True
+    st.session_state.risk_scores = display_data["risk_scores"]
+    st.session_state.risk_factors_by_disease = display_data["risk_factors_by_disease"]
+    st.session_state.factor_recommendations_map = display_data["factor_recommendations_map"]
+    st.session_state.comparison_data = display_data["comparison_data"]
+    st.session_state.comparison_data_by_disease = display_data["comparison_data_by_disease"]
+    st.session_state.similar_individuals = similar_individuals
+    st.session_state.selected_disease = None
+    # Mark that results were generated on Test_API page, not main page
+    st.session_state.results_page = 'test_api'
+    st.session_state.show_results_on_main_page = False
+
+
+def render_synthetic_mode():
+    """Render generated responses of a chosen size to see how the results view scales."""
+    st.markdown("---")
+    st.subheader("🧬 Synthetic Response")
+    st.caption("Generates a /prediction/all response locally; no backend call is made.")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        n_diseases = st.number_input("Diseases", min_value=1, max_value=20, value=4, step=1)
+        population_comparison = st.checkbox("Include population comparison", value=True)
+    with col2:
+        increasing = st.number_input("Risk-increasing factors per disease", min_value=0, max_value=1000, value=5, step=5)
+        decreasing = st.number_input("Protective factors per disease", min_value=0, max_value=1000, value=5, step=5)
+    with col3:
+        sentences = st.number_input("Recommendation length (sentences)", min_value=0, max_value=50, value=1, step=1)
+        seed = st.number_input("Seed", min_value=0, value=0, step=1)
+    open_details = st.checkbox("Open the first disease's details", value=True,
+                               help="Risk factors and comparisons are only drawn for the selected disease.")
+
+    if st.button("🧬 Generate & Render", type="primary", use_container_width=True):
+        api_response = generate_prediction_response(
+            n_diseases=int(n_diseases),
+            increasing_factors=int(increasing),
+            decreasing_factors=int(decreasing),
+            recommendation_sentences=int(sentences),
+            population_comparison=population_comparison,
+            seed=int(seed)
+        )
+        started = time.perf_counter()
+        display_data = convert_api_response_to_display_format(_convert_api_to_frontend_format(api_response))
+        conversion_ms = (time.perf_counter() - started) * 1000
+        store_results(display_data, {})
+        if open_details and display_data["risk_scores"]:
+            st.session_state.selected_disease = next(iter(display_data["risk_scores"]))
+        st.session_state.synthetic_payload = {
+            "diseases": int(n_diseases),
+            "factors": int(n_diseases) * (int(increasing) + int(decreasing)),
+            "bytes": len(json.dumps(api_response)),
+            "conversion_ms": conversion_ms
+        }
+        st.rerun()
+
+    if st.session_state.get('prediction_done', False) and st.session_state.get('results_page') == 'test_api':
+        st.markdown("---")
+        started = time.perf_counter()
+        display_results()
+        render_ms = (time.perf_counter() - started) * 1000
+        payload = st.session_state.get('synthetic_payload')
+        if payload:
+            st.caption(
+                f"Payload: {payload['diseases']} diseases, {payload['factors']:,} SHAP factors, "
+                f"{payload['bytes'] / 1024:,.1f} KiB · conversion {payload['conversion_ms']:.1f} ms · "
+                f"display_results {render_ms:.1f} ms"
+            )
+
+
+def render_load_test_mode():
+    """Fire patient fixtures at the backend concurrently and report latency per fixture."""
+    st.markdown("---")
+    st.subheader("📈 Backend Load Test")
+    st.write(f"**API URL:** `{PREDICT_ALL_URL}`")
+    st.caption(
+        "Requests bypass the app's admission control and circuit breaker, so they run at the chosen "
+        "concurrency and failures here do not block predictions for other users."
+    )
+
+    fixtures = st.multiselect("Patient fixtures", list(PATIENT_FIXTURES), default=list(PATIENT_FIXTURES))
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        requests_per_fixture = st.number_input("Requests per fixture", min_value=1, max_value=1000, value=10, step=1)
+    with col2:
+        concurrency = st.number_input("Concurrency", min_value=1, max_value=64, value=4, step=1)
+    with col3:
+        timeout = st.number_input("Timeout (s)", min_value=1, max_value=120, value=30, step=1)
+    with st.expander("🔍 View Fixture Payloads", expanded=False):
+        st.json({name: PATIENT_FIXTURES[name] for name in fixtures})
+
+    if st.button("🚀 Run Load Test", type="primary", use_container_width=True, disabled=not fixtures):
+        progress = st.progress(0.0, text="Sending requests...")
+        results, wall_seconds = run_benchmark(
+            fixtures, int(requests_per_fixture), int(concurrency), timeout=int(timeout),
+            on_progress=lambda done, total: progress.progress(done / total, text=f"{done}/{total} requests")
+        )
+        progress.empty()
+        st.session_state.load_test_results = (results, wall_seconds, int(concurrency))
+
+    if 'load_test_results' not in st.session_state:
+        return
+    results, wall_seconds, used_concurrency = st.session_state.load_test_results
+    summary = summarize(results, wall_seconds)
+    total = summary.iloc[-1]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Requests", f"{len(results):,}")
+    col2.metric("Throughput", f"{total['Throughput (req/s)']:.1f} req/s")
+    col3.metric("p95 Latency", f"{total['p95 (ms)']:.0f} ms")
+    col4.metric("Error Rate", f"{total['Error Rate (%)']:.1f}%")
+    st.caption(f"{wall_seconds:.2f} s wall clock at concurrency {used_concurrency}")
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+
+    fig = px.histogram(
+        results, x="latency_ms", color="fixture", nbins=50, barmode="overlay", opacity=0.7,
+        labels={"latency_ms": "Latency (ms)", "fixture": "Fixture"}, title="Latency Distribution"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    errors = results[~results["ok"]]
+    if not errors.empty:
+        st.warning(f"{len(errors)} requests failed")
+        st.dataframe(
+            errors.groupby(["fixture", "error"]).size().reset_index(name="Count"),
+            use_container_width=True, hide_index=True
+        )
+
+
+mode = st.radio("Mode", [BACKEND_MODE, SYNTHETIC_MODE, LOAD_TEST_MODE], horizontal=True,
+                help="Synthetic responses exercise the results view at sizes the backend never returns; "
+                     "the load test sends patient fixtures concurrently.")
+if mode == SYNTHETIC_MODE:
+    render_synthetic_mode()
+    render_profile_panel()
+    st.stop()
+if mode == LOAD_TEST_MODE:
+    render_load_test_mode()
+    render_profile_panel()
+    st.stop()
+st.session_state.pop('synthetic_payload', None)
+
 # Fixed test data - Complete dataset to show all 4 diseases (CKD, Diabetes, Hypertension, CVD)
 TEST_DATA = {
     "input_data": {
@@ -76,10 +236,6 @@ TEST_DATA = {
     }
 }
 
-# API URL
-API_BASE_URL = os.getenv("API_BASE_URL", "https://disease-warning-1.onrender.com")
-PREDICT_ALL_URL = f"{API_BASE_URL}/prediction/all"
-
 st.markdown("---")
 st.subheader("Test Configuration")
 st.write(f"**API URL:** `{PREDICT_ALL_URL}`")
@@ -139,9 +295,14 @@ with st.expander("🔍 View Complete Raw Data", expanded=False):
 
 if st.button("🚀 Send POST Request & View Results", type="primary", use_container_width=True):
     with st.spinner("Sending POST request to backend..."):
+        submitted_at = time.perf_counter()
+        queue_notice = st.empty()
         try:
             # Send POST request
-            response = requests.post(PREDICT_ALL_URL, json=TEST_DATA, timeout=30)
+            response = predict_all(TEST_DATA, on_queue=lambda position: queue_notice.info(
+                f"⏳ Backend busy: number {position} in the queue"
+            ))
+            queue_notice.empty()
             
             if response.status_code == 200:
                 st.success("✅ API request successful!")
@@ -155,22 +316,15 @@ if st.button("🚀 Send POST Request & View Results", type="primary", use_contai
                 
                 # Convert API response to frontend format
                 with st.spinner("Converting API response..."):
-                    converted_response = _convert_api_to_frontend_format(api_response)
-                    
-                    # Convert to display format
-                    display_data = convert_api_response_to_display_format(converted_response)
+                    with CONVERSION_LATENCY.time(page='test_api'):
+                        converted_response = _convert_api_to_frontend_format(api_response, TEST_DATA["input_data"])
+                        
+                        # Convert to display format
+                        display_data = convert_api_response_to_display_format(converted_response)
                     
                     # Save to session state
-                    st.session_state.prediction_done = True
-                    st.session_state.risk_scores = display_data["risk_scores"]
-                    st.session_state.risk_factors_by_disease = display_data["risk_factors_by_disease"]
-                    st.session_state.factor_recommendations_map = display_data["factor_recommendations_map"]
-                    st.session_state.comparison_data = display_data["comparison_data"]
-                    st.session_state.comparison_data_by_disease = display_data["comparison_data_by_disease"]
-                    st.session_state.selected_disease = None
-                    # Mark that results were generated on Test_API page, not main page
-                    st.session_state.results_page = 'test_api'
-                    st.session_state.show_results_on_main_page = False
+                    store_results(display_data, _find_similar_individuals(TEST_DATA["input_data"], converted_response))
+                    SUBMIT_LATENCY.observe(time.perf_counter() - submitted_at, page='test_api')
                 
                 # Show conversion summary
                 st.info(f"""
@@ -198,6 +352,10 @@ if st.button("🚀 Send POST Request & View Results", type="primary", use_contai
                 except requests.exceptions.JSONDecodeError:
                     st.text(response.text)
                     
+        except BackendBusy as e:
+            queue_notice.empty()
+            st.error(f"❌ {e}")
+
         except requests.exceptions.ConnectionError as e:
             st.error(f"❌ Connection failed: {e}")
             st.info("💡 Make sure the backend service is running at the configured URL.")
@@ -226,3 +384,4 @@ st.info("""
 - Make sure the backend service is running before testing
 """)
 
+render_profile_panel()
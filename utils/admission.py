@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import requests
+
+from utils.metrics import ADMISSION_LIMITS, ADMISSION_REJECTIONS, BACKEND_IN_FLIGHT, BACKEND_QUEUE_DEPTH, QUEUE_WAIT
+
+# Process-wide limits on calls to the prediction backend, shared by every session.
+# BACKEND_RATE_LIMIT is in requests per second (0 = no rate limit); BACKEND_BURST
+# tokens may be spent at once after an idle period
+BACKEND_MAX_CONCURRENCY = int(os.getenv("BACKEND_MAX_CONCURRENCY", "4"))
+BACKEND_RATE_LIMIT = float(os.getenv("BACKEND_RATE_LIMIT", "0"))
+BACKEND_BURST = int(os.getenv("BACKEND_BURST", str(max(1, BACKEND_MAX_CONCURRENCY))))
+# Callers beyond BACKEND_QUEUE_SIZE waiting ones are turned away at once;
+# queued callers give up after BACKEND_QUEUE_TIMEOUT seconds
+BACKEND_QUEUE_SIZE = int(os.getenv("BACKEND_QUEUE_SIZE", "32"))
+BACKEND_QUEUE_TIMEOUT = float(os.getenv("BACKEND_QUEUE_TIMEOUT", "60"))
+
+
+class BackendBusy(requests.exceptions.RequestException):
+    """Raised when a backend call is not admitted: the queue is full or the wait timed out."""
+
+
+class AdmissionController:
+    """
+    Concurrency limit plus token bucket in front of the backend, with a bounded FIFO queue.
+
+    A caller is admitted when it is first in line, fewer than
+    `max_concurrency` calls are running and a rate token is available.
+    Waiting callers are told their queue position through `on_wait`.
+    """
+
+    def __init__(self, max_concurrency, rate_per_second=0, burst=1, queue_size=32, max_wait=60):
+        self.max_concurrency = max_concurrency
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._in_flight = 0
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        ADMISSION_LIMITS.set(max_concurrency, limit="max_concurrency")
+        ADMISSION_LIMITS.set(rate_per_second, limit="rate_per_second")
+        ADMISSION_LIMITS.set(burst, limit="burst")
+        ADMISSION_LIMITS.set(queue_size, limit="queue_size")
+
+    def _token_wait(self, now):
+        """Refill the bucket and return seconds until a token is available (0 if one is)."""
+        if self.rate_per_second <= 0:
+            return 0.0
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate_per_second)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate_per_second
+
+    def _publish(self):
+        BACKEND_IN_FLIGHT.set(self._in_flight)
+        BACKEND_QUEUE_DEPTH.set(len(self._queue))
+
+    def _can_start(self, now):
+        return self._in_flight < self.max_concurrency and self._token_wait(now) == 0
+
+    def _start(self):
+        if self.rate_per_second > 0:
+            self._tokens -= 1
+        self._in_flight += 1
+
+    @contextmanager
+    def admit(self, on_wait=None):
+        """
+        Hold a backend slot for the duration of the block.
+
+        `on_wait(position)` is called (without holding the lock) whenever the
+        caller's 1-based queue position changes. Raises BackendBusy if the
+        queue is full or the wait exceeds `max_wait`.
+        """
+        start = time.monotonic()
+        with self._cond:
+            if not self._queue and self._can_start(start):
+                self._start()
+            else:
+                self._wait_in_queue(start, on_wait)
+            self._publish()
+        QUEUE_WAIT.observe(time.monotonic() - start)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._publish()
+                self._cond.notify_all()
+
+    def _wait_in_queue(self, start, on_wait):
+        if len(self._queue) >= self.queue_size:
+            ADMISSION_REJECTIONS.inc(reason="queue_full")
+            raise BackendBusy(f"The prediction service is busy ({len(self._queue)} requests already waiting)")
+        ticket = object()
+        self._queue.append(ticket)
+        self._publish()
+        reported = None
+        try:
+            while True:
+                now = time.monotonic()
+                if self._queue[0] is ticket and self._can_start(now):
+                    self._start()
+                    return
+                remaining = start + self.max_wait - now
+                if remaining <= 0:
+                    ADMISSION_REJECTIONS.inc(reason="queue_timeout")
+                    raise BackendBusy(f"Waited {self.max_wait:g} s in the queue for the prediction service")
+                position = self._queue.index(ticket) + 1
+                if on_wait is not None and position != reported:
+                    reported = position
+                    self._cond.release()
+                    try:
+                        on_wait(position)
+                    finally:
+                        self._cond.acquire()
+                    continue
+                # Only the head of the queue waits for a token; others wait to move up
+                timeout = remaining
+                if self._queue[0] is ticket and self._in_flight < self.max_concurrency:
+                    timeout = min(remaining, self._token_wait(now))
+                self._cond.wait(timeout)
+        finally:
+            self._queue.remove(ticket)
+            self._publish()
+            self._cond.notify_all()
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from utils.constants import AGE_GROUP_BINS, AGE_GROUP_LABELS, DISEASE_LABELS, GENDER_MAP
+from utils.streaming_stats import ColumnSummary, RunningMoments
+
+
+class OverviewAggregate:
+    """
+    Mergeable partial state behind the "Overall Statistics" metrics.
+
+    Updated chunk by chunk while a dataset is ingested, so the overview can be
+    rendered before the whole file has been read.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.gender_counts = {}
+        self.age = RunningMoments()
+        self.has_gender = False
+        self.has_age = False
+
+    def update(self, frame):
+        """Fold a DataFrame chunk into the aggregate."""
+        self.rows += len(frame)
+        if 'RIAGENDR' in frame.columns:
+            self.has_gender = True
+            for code, count in frame['RIAGENDR'].value_counts().items():
+                self.gender_counts[int(code)] = self.gender_counts.get(int(code), 0) + int(count)
+        if 'RIDAGEYR' in frame.columns:
+            self.has_age = True
+            self.age.update(frame['RIDAGEYR'].to_numpy(dtype=float))
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        for code, count in other.gender_counts.items():
+            self.gender_counts[code] = self.gender_counts.get(code, 0) + count
+        self.age.merge(other.age)
+        self.has_gender = self.has_gender or other.has_gender
+        self.has_age = self.has_age or other.has_age
+        return self
+
+    def to_dict(self):
+        return {
+            "rows": self.rows,
+            "gender_counts": {str(k): v for k, v in self.gender_counts.items()},
+            "age": self.age.to_dict(),
+            "has_gender": self.has_gender,
+            "has_age": self.has_age
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregate = cls()
+        aggregate.rows = data["rows"]
+        aggregate.gender_counts = {int(k): v for k, v in data["gender_counts"].items()}
+        aggregate.age = RunningMoments.from_dict(data["age"])
+        aggregate.has_gender = data["has_gender"]
+        aggregate.has_age = data["has_age"]
+        return aggregate
+
+
+class DatasetAggregate:
+    """
+    Mergeable partial state for every figure on the dataset statistics page.
+
+    Holds, per partition: the overview, moments and quantile sketches for the
+    health metrics, and disease case/respondent tallies overall and by gender
+    and age group. Each partition's aggregate is built once when it is
+    ingested; appending data only aggregates the new rows and merges the
+    result with the existing partials.
+    """
+
+    def __init__(self, metric_columns=()):
+        self.overview = OverviewAggregate()
+        self.metrics = {col: ColumnSummary() for col in metric_columns}
+        # disease_key -> {"all": [cases, total], "gender": {code: [...]}, "age_group": {label: [...]}}
+        self.prevalence = {}
+
+    @property
+    def rows(self):
+        return self.overview.rows
+
+    def update(self, frame):
+        """Fold a DataFrame chunk into every part of the aggregate."""
+        self.overview.update(frame)
+        for col, summary in self.metrics.items():
+            if col in frame.columns:
+                summary.update(pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype=np.float64))
+
+        genders = frame['RIAGENDR'] if 'RIAGENDR' in frame.columns else None
+        age_groups = None
+        if 'RIDAGEYR' in frame.columns:
+            age_groups = pd.cut(frame['RIDAGEYR'], bins=AGE_GROUP_BINS, labels=AGE_GROUP_LABELS)
+
+        for disease_key, disease_info in DISEASE_LABELS.items():
+            col_name = disease_info['col']
+            if col_name not in frame.columns:
+                continue
+            valid = frame[col_name].isin([1, 2])
+            cases = frame[col_name] == 1
+            tally = self.prevalence.setdefault(disease_key, {"all": [0, 0], "gender": {}, "age_group": {}})
+            _add_tally(tally["all"], int(cases.sum()), int(valid.sum()))
+            if genders is not None:
+                for code in GENDER_MAP:
+                    in_gender = valid & (genders == code)
+                    if in_gender.any():
+                        _add_tally(tally["gender"].setdefault(str(code), [0, 0]),
+                                   int((cases & in_gender).sum()), int(in_gender.sum()))
+            if age_groups is not None:
+                case_counts = cases[valid].groupby(age_groups[valid], observed=True).agg(['sum', 'count'])
+                for label, row in case_counts.iterrows():
+                    if row['count'] > 0:
+                        _add_tally(tally["age_group"].setdefault(str(label), [0, 0]),
+                                   int(row['sum']), int(row['count']))
+        return self
+
+    def merge(self, other):
+        self.overview.merge(other.overview)
+        for col, summary in other.metrics.items():
+            if col in self.metrics:
+                self.metrics[col].merge(summary)
+            else:
+                self.metrics[col] = ColumnSummary.from_dict(summary.to_dict())
+        for disease_key, other_tally in other.prevalence.items():
+            tally = self.prevalence.setdefault(disease_key, {"all": [0, 0], "gender": {}, "age_group": {}})
+            _add_tally(tally["all"], *other_tally["all"])
+            for group in ("gender", "age_group"):
+                for key, (cases, total) in other_tally[group].items():
+                    _add_tally(tally[group].setdefault(key, [0, 0]), cases, total)
+        return self
+
+    def to_dict(self):
+        return {
+            "overview": self.overview.to_dict(),
+            "metrics": {col: summary.to_dict() for col, summary in self.metrics.items()},
+            "prevalence": self.prevalence
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregate = cls()
+        aggregate.overview = OverviewAggregate.from_dict(data["overview"])
+        aggregate.metrics = {col: ColumnSummary.from_dict(s) for col, s in data["metrics"].items()}
+        aggregate.prevalence = data["prevalence"]
+        return aggregate
+
+
+def _add_tally(tally, cases, total):
+    tally[0] += cases
+    tally[1] += total
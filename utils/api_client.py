@@ -0,0 +1,142 @@
+import os
+import time
+from contextlib import nullcontext
+
+import requests
+
+from utils.admission import (
+    BACKEND_BURST, BACKEND_MAX_CONCURRENCY, BACKEND_QUEUE_SIZE, BACKEND_QUEUE_TIMEOUT, BACKEND_RATE_LIMIT,
+    AdmissionController
+)
+from utils.circuit_breaker import (
+    BACKEND_CONNECT_TIMEOUT, BACKEND_FAILURE_THRESHOLD, BACKEND_HALF_OPEN_PROBES, BACKEND_READ_TIMEOUT_MAX,
+    BACKEND_READ_TIMEOUT_MIN, BACKEND_RESET_TIMEOUT, BACKEND_TIMEOUT_MULTIPLIER, BACKEND_TIMEOUT_PERCENTILE,
+    AdaptiveTimeout, CircuitBreaker
+)
+from utils.metrics import BACKEND_COALESCED, BACKEND_LATENCY, BACKEND_REQUESTS, export_metrics, start_exporter
+from utils.single_flight import SingleFlight, payload_key
+from utils.tracing import current_span, span, trace_headers
+from utils.traffic_capture import record_exchange
+
+# 支持环境变量配置，本地开发时设置为 http://localhost:8000
+API_BASE_URL = os.getenv("API_BASE_URL", "https://disease-warning-1.onrender.com")
+PREDICT_ALL_URL = f"{API_BASE_URL}/prediction/all"
+PREDICT_ALL_ENDPOINT = "/prediction/all"
+
+start_exporter()
+
+# Identical payloads submitted at the same time (double clicks, several
+# sessions sending the same patient) share one backend call
+_in_flight = SingleFlight()
+
+# Calls that do reach the backend are admitted under process-wide limits
+_admission = AdmissionController(
+    BACKEND_MAX_CONCURRENCY, BACKEND_RATE_LIMIT, BACKEND_BURST, BACKEND_QUEUE_SIZE, BACKEND_QUEUE_TIMEOUT
+)
+
+# Admitted calls fail fast while the backend is down, and their read
+# timeout follows the backend's recent latency
+_breaker = CircuitBreaker(BACKEND_FAILURE_THRESHOLD, BACKEND_RESET_TIMEOUT, BACKEND_HALF_OPEN_PROBES)
+_timeouts = AdaptiveTimeout(
+    BACKEND_CONNECT_TIMEOUT, BACKEND_READ_TIMEOUT_MIN, BACKEND_READ_TIMEOUT_MAX,
+    BACKEND_TIMEOUT_PERCENTILE, BACKEND_TIMEOUT_MULTIPLIER
+)
+
+
+def _outcome(response=None, error=None):
+    if error is None:
+        return "ok" if response.status_code == 200 else "http_error"
+    if isinstance(error, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "connection_error"
+    return "error"
+
+
+def predict_all(payload, timeout=None, capture=True, coalesce=True, on_queue=None, shared_limits=True):
+    """
+    POST a payload to /prediction/all and return the `requests.Response`.
+
+    While a request for the same payload (compared by canonical hash) is in
+    flight, the call waits for it and returns the same response instead of
+    calling the backend again; pass `coalesce=False` to always send. The
+    response body is parsed once and `response.json()` returns that shared
+    object, so callers must treat it as read-only.
+
+    Backend calls wait for admission (see utils/admission.py); while queued,
+    `on_queue(position)` is called as the position changes, and
+    `BackendBusy` is raised if the queue is full or the wait times out.
+    Admitted calls pass a circuit breaker, which raises `BackendUnavailable`
+    (a `ConnectionError`) without calling the backend while it is down. The
+    read timeout adapts to recent latency unless `timeout` (seconds) is given;
+    the connect timeout is always BACKEND_CONNECT_TIMEOUT. Pass
+    `shared_limits=False` (synthetic load) to bypass admission and the
+    breaker and keep the call's latency out of the adaptive timeout, so it
+    neither competes with user traffic nor trips the app's circuit.
+
+    Every backend call is counted and timed by outcome and status code, and
+    recorded as an HTTP span whose trace id is sent in the request headers.
+    When traffic capture is on, the exchange is also logged for replay
+    unless `capture` is False (synthetic load). Exceptions from `requests`
+    propagate unchanged so callers keep their own handling.
+    """
+    if not coalesce:
+        return _post_prediction(payload, timeout, capture, on_queue, shared_limits)
+    response, shared = _in_flight.do(
+        payload_key(payload), lambda: _post_prediction(payload, timeout, capture, on_queue, shared_limits)
+    )
+    if shared:
+        BACKEND_COALESCED.inc(endpoint=PREDICT_ALL_ENDPOINT)
+        current = current_span()
+        if current is not None:
+            current.set_attribute("coalesced", True)
+    return response
+
+
+def _share_parsed_body(response):
+    """Parse a JSON body once and make `response.json()` return that object."""
+    try:
+        body = response.json()
+    except ValueError:
+        return
+    response.json = lambda **kwargs: body
+
+
+def _post_prediction(payload, timeout, capture, on_queue=None, shared_limits=True):
+    with _admission.admit(on_queue) if shared_limits else nullcontext():
+        probe = _breaker.allow() if shared_limits else False
+        if timeout is None:
+            request_timeout = _timeouts.timeouts(probe)
+        else:
+            request_timeout = (BACKEND_CONNECT_TIMEOUT, timeout)
+        with span(f"POST {PREDICT_ALL_ENDPOINT}", url=PREDICT_ALL_URL, read_timeout=request_timeout[1]) as http_span:
+            start = time.perf_counter()
+            response = None
+            error = None
+            try:
+                response = requests.post(PREDICT_ALL_URL, json=payload, timeout=request_timeout, headers=trace_headers())
+                _share_parsed_body(response)
+                return response
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                outcome = _outcome(response, error)
+                status = str(response.status_code) if response is not None else ""
+                if shared_limits:
+                    # Only a backend that answers without a server error counts as healthy
+                    healthy = response is not None and response.status_code < 500
+                    _breaker.record(healthy, probe)
+                    if healthy:
+                        _timeouts.observe(elapsed)
+                    elif isinstance(error, requests.exceptions.ReadTimeout):
+                        _timeouts.observe(request_timeout[1])
+                BACKEND_REQUESTS.inc(endpoint=PREDICT_ALL_ENDPOINT, outcome=outcome, status=status)
+                BACKEND_LATENCY.observe(elapsed, endpoint=PREDICT_ALL_ENDPOINT, outcome=outcome)
+                export_metrics()
+                if capture:
+                    record_exchange(PREDICT_ALL_ENDPOINT, payload, response, elapsed, error)
+                if http_span is not None:
+                    http_span.set_attribute("outcome", outcome)
+                    http_span.set_attribute("status_code", status)
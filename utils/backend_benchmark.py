@@ -0,0 +1,84 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from utils.api_client import predict_all
+from utils.patient_fixtures import fixture_payload
+
+PERCENTILES = (50, 95, 99)
+
+
+def _timed_request(fixture, payload, timeout):
+    start = time.perf_counter()
+    try:
+        response = predict_all(payload, timeout=timeout, capture=False, coalesce=False, shared_limits=False)
+    except Exception as e:
+        return {
+            "fixture": fixture,
+            "latency_ms": (time.perf_counter() - start) * 1000,
+            "status": None,
+            "ok": False,
+            "error": type(e).__name__,
+            "bytes": 0
+        }
+    return {
+        "fixture": fixture,
+        "latency_ms": (time.perf_counter() - start) * 1000,
+        "status": response.status_code,
+        "ok": response.status_code == 200,
+        "error": None if response.status_code == 200 else f"HTTP {response.status_code}",
+        "bytes": len(response.content)
+    }
+
+
+def run_benchmark(fixtures, requests_per_fixture, concurrency, timeout=30, on_progress=None):
+    """
+    Send every fixture `requests_per_fixture` times, at most `concurrency` at once.
+
+    Requests are interleaved across fixtures so each one sees the same load.
+    They bypass the app's admission control and circuit breaker, so the run
+    measures the backend at the requested concurrency without throttling or
+    tripping the breaker for real users.
+    `on_progress(done, total)` is called as requests finish. Returns
+    (DataFrame with one row per request, wall-clock seconds).
+    """
+    jobs = [(name, fixture_payload(name)) for _ in range(requests_per_fixture) for name in fixtures]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="backend-benchmark") as pool:
+        futures = [pool.submit(_timed_request, name, payload, timeout) for name, payload in jobs]
+        for done, _ in enumerate(as_completed(futures), 1):
+            if on_progress is not None:
+                on_progress(done, len(jobs))
+    wall_seconds = time.perf_counter() - start
+    # Keep submission order so fixtures are listed in the order they were given
+    records = [future.result() for future in futures]
+    columns = ["fixture", "latency_ms", "status", "ok", "error", "bytes"]
+    return pd.DataFrame(records, columns=columns), wall_seconds
+
+
+def summarize(results, wall_seconds):
+    """
+    Per-fixture latency percentiles, throughput, error rate and response sizes.
+
+    Percentiles cover every request, failed ones included, since a timeout is
+    latency the user sees. Throughput is each fixture's share of the run's
+    requests over the run's wall-clock time; the "all" row totals the run.
+    """
+    groups = [(name, frame) for name, frame in results.groupby("fixture", sort=False)]
+    groups.append(("all", results))
+    rows = []
+    for name, frame in groups:
+        latencies = frame["latency_ms"].to_numpy()
+        sizes = frame.loc[frame["ok"], "bytes"].to_numpy()
+        row = {"Fixture": name, "Requests": len(frame)}
+        for q, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+            row[f"p{q} (ms)"] = value
+        row["Throughput (req/s)"] = len(frame) / wall_seconds if wall_seconds > 0 else np.nan
+        row["Error Rate (%)"] = 100.0 * (~frame["ok"]).mean()
+        row["Size min (B)"] = sizes.min() if len(sizes) else np.nan
+        row["Size median (B)"] = np.median(sizes) if len(sizes) else np.nan
+        row["Size max (B)"] = sizes.max() if len(sizes) else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows).round(2)
@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import requests
+
+from utils.metrics import BACKEND_READ_TIMEOUT, CIRCUIT_REJECTIONS, CIRCUIT_STATE
+
+# Consecutive failed calls (connection errors, timeouts, 5xx) that open the
+# circuit; after BACKEND_RESET_TIMEOUT seconds up to BACKEND_HALF_OPEN_PROBES
+# calls are let through to test whether the backend has recovered
+BACKEND_FAILURE_THRESHOLD = int(os.getenv("BACKEND_FAILURE_THRESHOLD", "5"))
+BACKEND_RESET_TIMEOUT = float(os.getenv("BACKEND_RESET_TIMEOUT", "30"))
+BACKEND_HALF_OPEN_PROBES = int(os.getenv("BACKEND_HALF_OPEN_PROBES", "1"))
+
+# Connect timeout is fixed; the read timeout follows observed latency:
+# multiplier x the chosen percentile of recent calls, clamped to [min, max]
+BACKEND_CONNECT_TIMEOUT = float(os.getenv("BACKEND_CONNECT_TIMEOUT", "3.05"))
+BACKEND_READ_TIMEOUT_MIN = float(os.getenv("BACKEND_READ_TIMEOUT_MIN", "5"))
+BACKEND_READ_TIMEOUT_MAX = float(os.getenv("BACKEND_READ_TIMEOUT_MAX", "30"))
+BACKEND_TIMEOUT_PERCENTILE = float(os.getenv("BACKEND_TIMEOUT_PERCENTILE", "99"))
+BACKEND_TIMEOUT_MULTIPLIER = float(os.getenv("BACKEND_TIMEOUT_MULTIPLIER", "2"))
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class BackendUnavailable(requests.exceptions.ConnectionError):
+    """Raised without calling the backend while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the backend is down.
+
+    Closed: calls go through; `failure_threshold` consecutive failures open
+    the circuit. Open: calls raise BackendUnavailable until `reset_timeout`
+    has passed. Half-open: up to `probes` calls go through; a success closes
+    the circuit, a failure opens it for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, probes=1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probes = probes
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        CIRCUIT_STATE.set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self):
+        return self._state
+
+    def _set_state(self, state):
+        self._state = state
+        CIRCUIT_STATE.set(_STATE_VALUES[state])
+
+    def allow(self):
+        """Return True if the call is a half-open probe; raise BackendUnavailable if it may not run."""
+        with self._lock:
+            if self._state == OPEN:
+                remaining = self._opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    CIRCUIT_REJECTIONS.inc()
+                    raise BackendUnavailable(
+                        f"Prediction service unavailable after {self._failures} failed requests; "
+                        f"retrying in {remaining:.0f} s"
+                    )
+                self._set_state(HALF_OPEN)
+            if self._state == HALF_OPEN:
+                if self._probes_in_flight >= self.probes:
+                    CIRCUIT_REJECTIONS.inc()
+                    raise BackendUnavailable("Prediction service is recovering; checking it now, please retry shortly")
+                self._probes_in_flight += 1
+                return True
+            return False
+
+    def record(self, success, probe):
+        """Report the outcome of a call admitted by `allow()`."""
+        with self._lock:
+            if probe:
+                self._probes_in_flight -= 1
+            if success:
+                self._failures = 0
+                if self._state != CLOSED:
+                    self._set_state(CLOSED)
+                return
+            self._failures += 1
+            if probe or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+
+class AdaptiveTimeout:
+    """
+    (connect, read) timeouts for requests, with the read timeout derived from recent latency.
+
+    Until `min_samples` calls have been observed the maximum read timeout
+    is used. A call that timed out is recorded at its timeout, so a backend
+    that slows down pushes the timeout up instead of failing every call.
+    """
+
+    def __init__(self, connect=3.05, read_min=5, read_max=30, percentile=99, multiplier=2,
+                 window=200, min_samples=20):
+        self.connect = connect
+        self.read_min = read_min
+        self.read_max = read_max
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        BACKEND_READ_TIMEOUT.set(read_max)
+
+    def read_timeout(self):
+        with self._lock:
+            samples = list(self._samples)
+        if len(samples) < self.min_samples:
+            return self.read_max
+        value = self.multiplier * float(np.percentile(samples, self.percentile))
+        return min(max(value, self.read_min), self.read_max)
+
+    def timeouts(self, probe=False):
+        """Return the (connect, read) tuple for the next call; probes get the maximum read timeout."""
+        return (self.connect, self.read_max if probe else self.read_timeout())
+
+    def observe(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+        BACKEND_READ_TIMEOUT.set(self.read_timeout())
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+from utils.constants import AGE_GROUP_BINS, AGE_GROUP_LABELS, DISEASE_LABELS, GENDER_MAP, RACE_MAP
+
+# Coded columns a cohort can be sliced by: {dimension: (column, {code: label})}.
+# Age groups are derived from RIDAGEYR with the page's age bins.
+COHORT_DIMENSIONS = {
+    "Gender": ("RIAGENDR", GENDER_MAP),
+    "Race/Ethnicity": ("RIDRETH3", {code: name for name, code in RACE_MAP.items()}),
+    "Smoking History": ("SMQ020", {1: "Ever smoked", 2: "Never smoked"}),
+    "Age Group": ("RIDAGEYR", dict(enumerate(AGE_GROUP_LABELS))),
+}
+
+# Set-bit count of every byte value, for NumPy builds without np.bitwise_count
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bits):
+    """Return the number of set bits in a packed bitmap."""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(bits).sum(dtype=np.int64))
+    return int(_POPCOUNT[bits].sum(dtype=np.int64))
+
+
+def _pack(mask):
+    return np.packbits(np.asarray(mask, dtype=bool))
+
+
+class CohortIndex:
+    """
+    Packed bitmap indexes over the coded NHANES columns.
+
+    One bitmap (a bit per participant, 8 per byte) is built for every code of
+    every cohort dimension, and for the cases and valid (1=Yes, 2=No)
+    respondents of every disease. A cohort is the AND across dimensions of the
+    OR of the selected codes, so slicing and recomputing prevalence only
+    touches n/8 bytes per bitmap instead of re-filtering the DataFrame.
+    """
+
+    def __init__(self, frame):
+        self.rows = len(frame)
+        self.bitmaps = {}
+        for dimension, (col_name, labels) in COHORT_DIMENSIONS.items():
+            if col_name not in frame.columns:
+                continue
+            values = pd.to_numeric(frame[col_name], errors="coerce")
+            if dimension == "Age Group":
+                values = pd.Series(pd.cut(values, bins=AGE_GROUP_BINS, labels=False))
+            values = values.to_numpy(dtype=np.float64)
+            self.bitmaps[dimension] = {label: _pack(values == code) for code, label in labels.items()}
+
+        self.diseases = {}
+        for disease_key, disease_info in DISEASE_LABELS.items():
+            col_name = disease_info['col']
+            if col_name not in frame.columns:
+                continue
+            values = pd.to_numeric(frame[col_name], errors="coerce").to_numpy(dtype=np.float64)
+            self.diseases[disease_key] = {
+                "cases": _pack(values == 1),
+                "valid": _pack((values == 1) | (values == 2))
+            }
+        self._all = _pack(np.ones(self.rows, dtype=bool))
+
+    def options(self):
+        """Return {dimension: [labels]} for the dimensions present in the data."""
+        return {dimension: list(bitmaps) for dimension, bitmaps in self.bitmaps.items()}
+
+    def select(self, selection=None, diagnosed=()):
+        """
+        Return the packed bitmap of a cohort.
+
+        `selection` maps a dimension to the labels to keep (an empty or
+        missing entry keeps everyone); `diagnosed` lists disease keys the
+        participants must all report (1=Yes).
+        """
+        bits = self._all.copy()
+        for dimension, labels in (selection or {}).items():
+            if not labels or dimension not in self.bitmaps:
+                continue
+            union = np.zeros_like(bits)
+            for label in labels:
+                np.bitwise_or(union, self.bitmaps[dimension][label], out=union)
+            np.bitwise_and(bits, union, out=bits)
+        for disease_key in diagnosed:
+            if disease_key in self.diseases:
+                np.bitwise_and(bits, self.diseases[disease_key]["cases"], out=bits)
+        return bits
+
+    def count(self, bits):
+        return popcount(bits)
+
+    def prevalence(self, bits):
+        """Return {disease_key: (cases, total)} among the cohort's valid respondents."""
+        result = {}
+        for disease_key, bitmaps in self.diseases.items():
+            cases = popcount(np.bitwise_and(bits, bitmaps["cases"]))
+            total = popcount(np.bitwise_and(bits, bitmaps["valid"]))
+            result[disease_key] = (cases, total)
+        return result
+
+    def to_mask(self, bits):
+        """Unpack a cohort bitmap into a boolean row mask."""
+        return np.unpackbits(bits, count=self.rows).astype(bool)
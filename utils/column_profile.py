@@ -0,0 +1,87 @@
+import math
+
+import pyarrow.compute as pc
+
+# Columns with at most this many distinct values keep them in their profile,
+# so distinct counts stay exact when partition profiles are merged
+PROFILE_MAX_VALUES = 256
+
+
+def profile_column(column):
+    """
+    Profile one Arrow column with vectorized reductions.
+
+    Missing values are Arrow nulls plus NaN (numeric columns are stored as
+    float64 with NaN). The remaining values are reduced with min_max and
+    count_distinct; low-cardinality columns also keep their distinct values.
+    """
+    missing = pc.is_null(column, nan_is_null=True)
+    present = pc.filter(column, pc.invert(missing))
+    bounds = pc.min_max(present).as_py()
+    distinct = pc.count_distinct(present).as_py()
+    return {
+        "dtype": str(column.type),
+        "missing": int(pc.sum(missing).as_py() or 0),
+        "distinct": int(distinct),
+        "distinct_exact": True,
+        "values": pc.unique(present).to_pylist() if distinct <= PROFILE_MAX_VALUES else None,
+        "min": _json_value(bounds["min"]),
+        "max": _json_value(bounds["max"]),
+        "memory_bytes": int(column.nbytes)
+    }
+
+
+def _json_value(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def profile_table(table):
+    """Return {"rows": n, "columns": {name: profile}} for every column of an Arrow table."""
+    return {
+        "rows": table.num_rows,
+        "columns": {name: profile_column(table.column(name)) for name in table.column_names}
+    }
+
+
+def merge_profiles(profiles):
+    """
+    Combine per-partition table profiles into one, without touching the data.
+
+    A column absent from a partition counts as missing for that partition's
+    rows. Distinct counts are exact when every partition kept its distinct
+    values; otherwise the largest partition count is a lower bound and
+    `distinct_exact` is False.
+    """
+    rows = sum(profile["rows"] for profile in profiles)
+    names = list(dict.fromkeys(name for profile in profiles for name in profile["columns"]))
+    columns = {}
+    for name in names:
+        parts = [profile["columns"][name] for profile in profiles if name in profile["columns"]]
+        absent_rows = sum(profile["rows"] for profile in profiles if name not in profile["columns"])
+        dtypes = list(dict.fromkeys(part["dtype"] for part in parts))
+        merged = {
+            "dtype": " / ".join(dtypes),
+            "missing": sum(part["missing"] for part in parts) + absent_rows,
+            "min": None,
+            "max": None,
+            "memory_bytes": sum(part["memory_bytes"] for part in parts)
+        }
+        if all(part["values"] is not None for part in parts):
+            values = list(dict.fromkeys(value for part in parts for value in part["values"]))
+            merged["distinct"] = len(values)
+            merged["distinct_exact"] = True
+            merged["values"] = values if len(values) <= PROFILE_MAX_VALUES else None
+        else:
+            merged["distinct"] = max(part["distinct"] for part in parts)
+            merged["distinct_exact"] = len(parts) == 1 and parts[0]["distinct_exact"]
+            merged["values"] = None
+        # Bounds of different types (e.g. text and numbers) cannot be compared
+        if len(dtypes) == 1:
+            lows = [part["min"] for part in parts if part["min"] is not None]
+            highs = [part["max"] for part in parts if part["max"] is not None]
+            merged["min"] = min(lows) if lows else None
+            merged["max"] = max(highs) if highs else None
+        columns[name] = merged
+    return {"rows": rows, "columns": columns}
@@ -107,4 +107,29 @@ ALCOHOL_CONSUMPTION_RANGE = {
     "2-3 days per week": 130,
     "4-5 days per week": 240,
     "Nearly every day/Everyday": 300
-}
\ No newline at end of file
+}
+
+# Age bands used for dataset statistics and population comparison strata
+AGE_GROUP_BINS = [0, 20, 30, 40, 50, 60, 70, 80, 200]
+AGE_GROUP_LABELS = ['0-20', '20-30', '30-40', '40-50', '50-60', '60-70', '70-80', '80+']
+
+# Self-reported diagnosis columns in the NHANES dataset (1=Yes, 2=No)
+DISEASE_LABELS = {
+    'diabetes': {'col': 'DIQ010', 'name': 'Diabetes'},
+    'hypertension': {'col': 'BPQ020', 'name': 'Hypertension'},
+    'cvd': {'col': 'MCQ160B', 'name': 'Cardiovascular Disease'},
+    'ckd': {'col': 'MCQ220', 'name': 'Chronic Kidney Disease'}
+}
+
+# Continuous health metrics summarized on the dataset statistics page
+HEALTH_METRICS = {
+    'BMI': 'BMXBMI',
+    'Waist Circumference': 'BMXWAIST',
+    'Systolic BP': 'BPXSY1',
+    'Diastolic BP': 'BPXDI1',
+    'HbA1c': 'LBXGH',
+    'Total Cholesterol': 'LBXTC',
+    'HDL Cholesterol': 'LBDHDD',
+    'LDL Cholesterol': 'LBDLDL',
+    'Triglycerides': 'LBXSTR'
+}
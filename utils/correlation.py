@@ -0,0 +1,66 @@
+import numpy as np
+
+# Cells per axis of the grid used to thin scatter plots
+DOWNSAMPLE_GRID = 400
+
+
+def pairwise_correlation(values):
+    """
+    Pearson correlations with pairwise-complete observations.
+
+    `values` is an (n, p) array with NaN for missing entries. Every pair of
+    columns uses the rows where both are present, and all pairs come out of
+    a few float32 matrix products instead of a loop over pairs. Columns are
+    centred first so the float32 sums do not lose precision.
+
+    Returns (corr, counts): p x p matrices of coefficients (NaN where a pair
+    has fewer than 3 rows or no variance) and of rows used per pair.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    present = ~np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        centred = values - np.nanmean(values, axis=0)
+    mask = present.astype(np.float32)
+    x = np.where(present, centred, 0.0).astype(np.float32)
+
+    counts = mask.T @ mask
+    # sums[i, j]: sum of column i over the rows where column j is present
+    sums = x.T @ mask
+    squares = (x * x).T @ mask
+    products = x.T @ x
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = products - sums * sums.T / counts
+        var_i = squares - sums ** 2 / counts
+        corr = cov / np.sqrt(var_i * var_i.T)
+    corr[(counts < 3) | ~np.isfinite(corr)] = np.nan
+    return np.clip(corr, -1.0, 1.0), counts.astype(np.int64)
+
+
+def downsample_points(x, y, max_points=5000, seed=0):
+    """
+    Pick at most `max_points` indices of (x, y) for plotting.
+
+    Points are first thinned to one per cell of a DOWNSAMPLE_GRID x
+    DOWNSAMPLE_GRID grid, which keeps outliers and the shape of sparse
+    regions, then sampled uniformly (with a fixed seed) if still too many.
+    Rows where either coordinate is missing are dropped.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    rows = np.flatnonzero(~np.isnan(x) & ~np.isnan(y))
+    if len(rows) <= max_points:
+        return rows
+
+    cells = np.zeros(len(rows), dtype=np.int64)
+    for axis in (x[rows], y[rows]):
+        low, high = axis.min(), axis.max()
+        span = high - low if high > low else 1.0
+        cells = cells * DOWNSAMPLE_GRID + np.minimum(((axis - low) / span * DOWNSAMPLE_GRID).astype(np.int64),
+                                                     DOWNSAMPLE_GRID - 1)
+    _, first = np.unique(cells, return_index=True)
+    rows = rows[np.sort(first)]
+    if len(rows) > max_points:
+        rng = np.random.default_rng(seed)
+        rows = np.sort(rng.choice(rows, size=max_points, replace=False))
+    return rows
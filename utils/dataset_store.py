@@ -0,0 +1,455 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import streamlit as st
+
+from utils.aggregates import DatasetAggregate
+from utils.column_profile import profile_table
+from utils.constants import HEALTH_METRICS
+from utils.metrics import CACHE_LOOKUPS
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+DATASET_PATH = DATA_DIR / "nhanes_2021_2023_master.csv"
+
+# One CSV per survey cycle, e.g. nhanes_2017_2018_master.csv -> cycle "2017-2018"
+CYCLE_FILE_PATTERN = re.compile(r"^nhanes_(\d{4})_(\d{4})_master\.csv$")
+
+# Batches appended to a cycle later become extra partitions of that cycle: drop
+# the new rows in here as their own CSV and only that file is ingested and
+# aggregated; the cycle's existing partitions keep their cached partials
+APPENDS_DIR = DATA_DIR / "appends"
+APPEND_FILE_PATTERN = re.compile(r"^nhanes_(\d{4})_(\d{4})_append_[\w-]+\.csv$")
+
+# Columnar copies of the CSV files live here; override to put them on a shared volume
+CACHE_DIR = Path(os.getenv("DATASET_CACHE_DIR", str(DATA_DIR / ".cache")))
+
+# Rows parsed per CSV chunk during ingestion; bounds peak memory
+CHUNK_ROWS = int(os.getenv("DATASET_CHUNK_ROWS", "50000"))
+
+# Rows are clustered by these columns within each chunk and summarized in
+# zone maps (min/max per block of ZONE_ROWS) so filters can skip blocks
+CLUSTER_COLUMNS = ['RIAGENDR', 'RIDAGEYR']
+ZONE_ROWS = 4096
+
+
+def list_cycles(data_dir=DATA_DIR):
+    """
+    Return {cycle: [csv_path, ...]} for every NHANES cycle, oldest first.
+
+    Each path is one partition: the cycle's master file followed by any
+    batches appended to it, in the order they were added.
+    """
+    cycles = {}
+    for path in sorted(Path(data_dir).glob("nhanes_*_master.csv")):
+        match = CYCLE_FILE_PATTERN.match(path.name)
+        if match:
+            cycles[f"{match.group(1)}-{match.group(2)}"] = [path]
+    appends_dir = Path(data_dir) / APPENDS_DIR.name
+    for path in sorted(appends_dir.glob("nhanes_*_append_*.csv")):
+        match = APPEND_FILE_PATTERN.match(path.name)
+        if match:
+            cycles.setdefault(f"{match.group(1)}-{match.group(2)}", []).append(path)
+    return dict(sorted(cycles.items()))
+
+
+def arrow_cache_path(csv_path):
+    """Return the path of the Arrow IPC file that mirrors the given CSV."""
+    return CACHE_DIR / f"{Path(csv_path).stem}.arrow"
+
+
+def sidecar_path(csv_path, name):
+    """Return the path of a JSON file persisted next to the dataset's Arrow cache."""
+    return CACHE_DIR / f"{Path(csv_path).stem}.{name}.json"
+
+
+def dataset_fingerprint(csv_path=DATASET_PATH):
+    """Identify the current contents of a dataset file by its size and mtime."""
+    stat = Path(csv_path).stat()
+    return f"{Path(csv_path).name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def write_sidecar(csv_path, name, payload, fingerprint=None):
+    """
+    Atomically persist a JSON payload tagged with the dataset fingerprint.
+
+    Pass the `fingerprint` taken before the data was read if the CSV may have
+    changed since; it defaults to the current one.
+    """
+    path = sidecar_path(csv_path, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    fingerprint = fingerprint or dataset_fingerprint(csv_path)
+    tmp_path.write_text(json.dumps({"fingerprint": fingerprint, "data": payload}))
+    os.replace(tmp_path, path)
+
+
+def read_sidecar(csv_path, name):
+    """Return a persisted payload, or None if missing or built from different data."""
+    path = sidecar_path(csv_path, name)
+    stored = None
+    if path.exists():
+        try:
+            stored = json.loads(path.read_text())
+        except (OSError, ValueError):
+            stored = None
+    if stored is None or stored.get("fingerprint") != dataset_fingerprint(csv_path):
+        CACHE_LOOKUPS.inc(cache=f"sidecar_{name}", result="miss")
+        return None
+    CACHE_LOOKUPS.inc(cache=f"sidecar_{name}", result="hit")
+    return stored["data"]
+
+
+# Schema metadata key holding the fingerprint of the CSV an Arrow copy was built from
+_FINGERPRINT_KEY = b"dataset_fingerprint"
+
+
+def _is_stale(csv_path, arrow_path):
+    """
+    The Arrow copy must be rebuilt when it is missing or was built from other data.
+
+    The CSV's fingerprint is stored in the copy's schema metadata, so a CSV
+    replaced by one with an older mtime (cp -p, restored backups) is caught
+    as well; only the file footer is read.
+    """
+    if not arrow_path.exists():
+        return True
+    try:
+        with pa.memory_map(str(arrow_path), "r") as source:
+            metadata = ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return True
+    return metadata.get(_FINGERPRINT_KEY) != dataset_fingerprint(csv_path).encode()
+
+
+def _table_fingerprint(table):
+    """Fingerprint of the CSV a mapped table was built from; sidecars derived from it carry this one."""
+    return table.schema.metadata[_FINGERPRINT_KEY].decode()
+
+
+def needs_ingest(csv_path=DATASET_PATH):
+    """Return True if the CSV has to be (re)ingested before it can be mapped."""
+    return _is_stale(csv_path, arrow_cache_path(csv_path))
+
+
+def _schema_from_chunk(chunk):
+    """
+    Fix the Arrow schema from the first chunk; later chunks are checked against it.
+
+    Every numeric column is stored as float64 with NaN for missing values:
+    later chunks may contain gaps in a column that started out as integers,
+    and NaN (unlike Arrow nulls) lets pandas wrap the buffers without copying.
+    """
+    fields = []
+    for name, dtype in chunk.dtypes.items():
+        if pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+            fields.append(pa.field(str(name), pa.float64()))
+        else:
+            fields.append(pa.field(str(name), pa.large_string()))
+    return pa.schema(fields)
+
+
+class _ColumnSpill:
+    """
+    Column-wise spill of ingested chunks.
+
+    Numeric chunks are appended to one raw float64 file per column, so the
+    final Arrow file can be written with a single contiguous batch straight
+    from memory-mapped spill files instead of from process memory. String
+    columns (rare in NHANES) are kept as Arrow chunks.
+    """
+
+    def __init__(self, schema, spill_dir):
+        self.schema = schema
+        self.spill_dir = Path(spill_dir)
+        self.rows = 0
+        self._files = {}
+        self._strings = {}
+        for idx, field in enumerate(schema):
+            if pa.types.is_floating(field.type):
+                self._files[field.name] = open(self.spill_dir / f"{idx}.f64", "wb")
+            else:
+                self._strings[field.name] = []
+
+    def append(self, chunk, chunk_index=0):
+        """
+        Spill one chunk, checking it against the schema fixed by the first.
+
+        Numbers in a string column are stored as text. A non-numeric value in
+        a numeric column raises ValueError naming the column and chunk rather
+        than being turned into a missing value.
+        """
+        for name, handle in self._files.items():
+            if name in chunk.columns:
+                column = chunk[name]
+                numeric = pd.to_numeric(column, errors="coerce")
+                invalid = numeric.isna() & column.notna()
+                if invalid.any():
+                    raise ValueError(
+                        f"Column {name!r} is numeric in the first chunk but chunk {chunk_index} "
+                        f"(rows {self.rows}-{self.rows + len(chunk) - 1}) contains "
+                        f"{column[invalid].iloc[0]!r}"
+                    )
+                values = numeric.to_numpy(dtype=np.float64)
+            else:
+                values = np.full(len(chunk), np.nan)
+            handle.write(values.tobytes())
+        for name, parts in self._strings.items():
+            values = chunk[name] if name in chunk.columns else pd.Series([None] * len(chunk))
+            missing = values.isna().to_numpy()
+            parts.append(pa.array(values.astype(str).tolist(), type=pa.large_string(), mask=missing))
+        self.rows += len(chunk)
+
+    def to_batch(self):
+        arrays = []
+        for idx, field in enumerate(self.schema):
+            if field.name in self._files:
+                self._files[field.name].close()
+                path = self.spill_dir / f"{idx}.f64"
+                if self.rows:
+                    values = np.memmap(path, dtype=np.float64, mode="r", shape=(self.rows,))
+                else:
+                    values = np.empty(0)
+                arrays.append(pa.array(values))
+            else:
+                parts = self._strings[field.name]
+                arrays.append(pa.concat_arrays(parts) if parts else pa.array([], type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def close(self):
+        for handle in self._files.values():
+            handle.close()
+
+
+def _zone_map(chunk, offset):
+    """Return [offset, length, {column: [min, max]}] entries for each block of a clustered chunk."""
+    zones = []
+    for start in range(0, len(chunk), ZONE_ROWS):
+        block = chunk.iloc[start:start + ZONE_ROWS]
+        bounds = {}
+        for col in CLUSTER_COLUMNS:
+            if col in block.columns:
+                values = pd.to_numeric(block[col], errors="coerce")
+                # An all-missing block gets no bounds and never matches a filter on that column
+                bounds[col] = None if values.isna().all() else [float(values.min()), float(values.max())]
+        zones.append([offset + start, len(block), bounds])
+    return zones
+
+
+def ingest_csv(csv_path=DATASET_PATH, chunk_rows=CHUNK_ROWS, on_chunk=None):
+    """
+    Stream a CSV into the memory-mappable Arrow cache.
+
+    The file is parsed `chunk_rows` rows at a time. Each chunk is clustered
+    by CLUSTER_COLUMNS and summarized in zone maps for `scan()`; it also
+    updates the partition's DatasetAggregate, after which
+    `on_chunk(aggregate, fraction_read)` is called so callers can render
+    progress. Peak memory is bounded by the chunk size. Zone maps and the
+    aggregate are persisted as sidecars and the aggregate is returned.
+
+    If parsing fails part-way the partial cache is discarded and the
+    exception propagates; aggregates already passed to `on_chunk` remain valid
+    for the rows read so far.
+    """
+    csv_path = Path(csv_path)
+    arrow_path = arrow_cache_path(csv_path)
+    arrow_path.parent.mkdir(parents=True, exist_ok=True)
+    total_bytes = max(csv_path.stat().st_size, 1)
+    # Taken before reading, so a CSV changed mid-ingest is re-ingested next time
+    fingerprint = dataset_fingerprint(csv_path)
+
+    aggregate = DatasetAggregate(HEALTH_METRICS.values())
+    zones = []
+    spill = None
+    spill_dir = tempfile.mkdtemp(prefix="ingest-", dir=arrow_path.parent)
+    tmp_path = arrow_path.with_name(f"{arrow_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(csv_path, "rb") as handle:
+            for chunk_index, chunk in enumerate(pd.read_csv(handle, chunksize=chunk_rows, low_memory=False)):
+                if spill is None:
+                    spill = _ColumnSpill(_schema_from_chunk(chunk), spill_dir)
+                cluster = [col for col in CLUSTER_COLUMNS if col in chunk.columns]
+                if cluster:
+                    chunk = chunk.sort_values(cluster, kind="stable", na_position="last")
+                zones.extend(_zone_map(chunk, spill.rows))
+                spill.append(chunk, chunk_index)
+                aggregate.update(chunk)
+                if on_chunk is not None:
+                    on_chunk(aggregate, min(handle.tell() / total_bytes, 1.0))
+
+        if spill is None:
+            raise ValueError(f"{csv_path.name} contains no rows")
+        batch = spill.to_batch()
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            batch = batch.replace_schema_metadata({_FINGERPRINT_KEY: fingerprint.encode()})
+            with ipc.new_file(sink, batch.schema) as writer:
+                writer.write_batch(batch)
+        del batch
+        os.replace(tmp_path, arrow_path)
+    finally:
+        if spill is not None:
+            spill.close()
+        shutil.rmtree(spill_dir, ignore_errors=True)
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    write_sidecar(csv_path, "zones", zones, fingerprint)
+    write_sidecar(csv_path, "aggregate", aggregate.to_dict(), fingerprint)
+    return aggregate
+
+
+@st.cache_resource(show_spinner=False)
+def _map_arrow_file(arrow_path, mtime_ns):
+    """
+    Memory-map an Arrow IPC file.
+
+    `cache_resource` hands the same object to every session without pickling
+    it, and the mapped pages live in the OS page cache, which is shared by all
+    worker processes on the node. `mtime_ns` is only part of the cache key.
+    """
+    source = pa.memory_map(arrow_path, "r")
+    return ipc.open_file(source).read_all()
+
+
+@st.cache_resource(show_spinner=False)
+def _mapped_dataframe(arrow_path, mtime_ns):
+    """Wrap the mapped table in a pandas DataFrame backed by the same buffers."""
+    table = _map_arrow_file(arrow_path, mtime_ns)
+    # split_blocks avoids consolidating columns into new 2-D blocks (a copy)
+    return table.to_pandas(split_blocks=True, self_destruct=False)
+
+
+def _ensure_cache(csv_path):
+    arrow_path = arrow_cache_path(csv_path)
+    if _is_stale(csv_path, arrow_path):
+        CACHE_LOOKUPS.inc(cache="arrow", result="miss")
+        ingest_csv(csv_path)
+    else:
+        CACHE_LOOKUPS.inc(cache="arrow", result="hit")
+    return arrow_path
+
+
+def load_table(csv_path=DATASET_PATH):
+    """Return the dataset as a zero-copy Arrow table over the memory-mapped cache."""
+    arrow_path = _ensure_cache(csv_path)
+    return _map_arrow_file(str(arrow_path), arrow_path.stat().st_mtime_ns)
+
+
+def load_dataframe(csv_path=DATASET_PATH):
+    """
+    Return the dataset as a DataFrame of read-only views.
+
+    Numeric columns point straight into the mapped file, so writing to them
+    raises; callers that need to modify data should take a `.copy()` first.
+    """
+    arrow_path = _ensure_cache(csv_path)
+    return _mapped_dataframe(str(arrow_path), arrow_path.stat().st_mtime_ns)
+
+
+def load_aggregate(csv_path=DATASET_PATH):
+    """Return a partition's persisted DatasetAggregate, rebuilding it from the mapped table if needed."""
+    _ensure_cache(csv_path)
+    stored = read_sidecar(csv_path, "aggregate")
+    if stored is not None:
+        return DatasetAggregate.from_dict(stored)
+    table = load_table(csv_path)
+    aggregate = DatasetAggregate(HEALTH_METRICS.values())
+    for batch in table.to_batches(max_chunksize=CHUNK_ROWS):
+        aggregate.update(batch.to_pandas())
+    write_sidecar(csv_path, "aggregate", aggregate.to_dict(), _table_fingerprint(table))
+    return aggregate
+
+
+def load_profile(csv_path=DATASET_PATH):
+    """Return a partition's persisted column profile, computing it from the mapped table if needed."""
+    _ensure_cache(csv_path)
+    stored = read_sidecar(csv_path, "profile")
+    if stored is not None:
+        return stored
+    table = load_table(csv_path)
+    profile = profile_table(table)
+    write_sidecar(csv_path, "profile", profile, _table_fingerprint(table))
+    return profile
+
+
+def _block_matches(bounds, column, low, high):
+    if column not in bounds:
+        # Column absent from this cycle: no row can satisfy the filter
+        return False
+    if bounds[column] is None:
+        return False
+    return bounds[column][1] >= low and bounds[column][0] <= high
+
+
+def _matching_blocks(csv_path, table, age_range, genders):
+    """Return (offset, length) blocks whose zone maps overlap the filters."""
+    zones = read_sidecar(csv_path, "zones")
+    if not zones:
+        return [(0, table.num_rows)]
+    blocks = []
+    for offset, length, bounds in zones:
+        if age_range is not None and not _block_matches(bounds, 'RIDAGEYR', *age_range):
+            continue
+        if genders is not None and not _block_matches(bounds, 'RIAGENDR', min(genders), max(genders)):
+            continue
+        # Merge adjacent blocks so each contiguous run is sliced once
+        if blocks and blocks[-1][0] + blocks[-1][1] == offset:
+            blocks[-1] = (blocks[-1][0], blocks[-1][1] + length)
+        else:
+            blocks.append((offset, length))
+    return blocks
+
+
+def scan(cycles=None, age_range=None, genders=None, columns=None, partitions=None):
+    """
+    Read the rows matching the given filters across cycle partitions.
+
+    Filters are pushed down into the reader. Cycles that are not selected are
+    never opened, and within a cycle only blocks whose zone maps overlap the
+    age and gender filters are sliced from the mapped file; the remaining
+    rows are filtered exactly. A CYCLE column records each row's partition.
+    `partitions`, if given, limits the scan to those CSV paths.
+
+    Returns a pyarrow Table (possibly empty).
+    """
+    pieces = []
+    cycle_partitions = [(cycle, path) for cycle, paths in list_cycles().items() for path in paths]
+    for cycle, csv_path in cycle_partitions:
+        if cycles is not None and cycle not in cycles:
+            continue
+        if partitions is not None and csv_path not in partitions:
+            continue
+        table = load_table(csv_path)
+        if age_range is not None and 'RIDAGEYR' not in table.column_names:
+            continue
+        if genders is not None and 'RIAGENDR' not in table.column_names:
+            continue
+
+        for offset, length in _matching_blocks(csv_path, table, age_range, genders):
+            block = table.slice(offset, length)
+            mask = None
+            if age_range is not None:
+                age = block.column('RIDAGEYR')
+                mask = pc.and_(pc.greater_equal(age, age_range[0]), pc.less_equal(age, age_range[1]))
+            if genders is not None:
+                in_genders = pc.is_in(block.column('RIAGENDR'), value_set=pa.array(genders, type=pa.float64()))
+                mask = in_genders if mask is None else pc.and_(mask, in_genders)
+            if mask is not None:
+                block = block.filter(mask)
+            if columns is not None:
+                block = block.select([col for col in columns if col in block.column_names])
+            block = block.append_column('CYCLE', pa.array([cycle] * block.num_rows, type=pa.string()))
+            pieces.append(block)
+
+    if not pieces:
+        return pa.table({'CYCLE': pa.array([], type=pa.string())})
+    return pa.concat_tables(pieces, promote_options="permissive")
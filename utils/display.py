@@ -3,6 +3,9 @@ import plotly.graph_objects as go
 import html
 import json
 
+from utils.profiling import profiled
+from utils.tracing import traced
+
 # Constants for styling
 RISK_COLORS = {
     "LOW": {"color": "#16a34a", "variant": "default", 
@@ -147,6 +150,7 @@ def _generate_comparison_card_html(disease, user_score, avg_score):
     """
 
 
+@profiled()
 def _display_risk_scores(risk_scores, risk_factors_by_disease):
     """Display risk scores for each disease using Plotly interactive cards."""
     st.markdown("### Risk Scores for Each Disease")
@@ -233,6 +237,7 @@ def _display_risk_scores(risk_scores, risk_factors_by_disease):
     st.markdown("")
 
 
+@profiled()
 def _display_selected_disease_factors(selected_disease, risk_factors_by_disease, factor_recommendations_map):
     """Display risk factors and recommendations for the selected disease (all factors)."""
     if not selected_disease:
@@ -302,6 +307,7 @@ def _display_selected_disease_factors(selected_disease, risk_factors_by_disease,
     st.markdown("")
 
 
+@profiled()
 def _display_comparison(selected_disease, risk_scores, comparison_data_by_disease):
     """Display comparison to similar individuals for the selected disease."""
     if not selected_disease:
@@ -406,6 +412,25 @@ def _display_comparison(selected_disease, risk_scores, comparison_data_by_diseas
     st.markdown(stats_html, unsafe_allow_html=True)
 
 
+def _display_similar_individuals(selected_disease, similar_individuals):
+    """Display disease outcomes among the most similar NHANES participants."""
+    similar = similar_individuals.get(selected_disease)
+    if not similar:
+        return
+    
+    st.markdown("")
+    st.markdown(f"**Similar Individuals: {selected_disease}**")
+    st.caption(
+        f"Based on the {similar['neighbors']} NHANES participants closest to you in age, "
+        "body measurements, blood pressure and available lab values"
+    )
+    col1, col2 = st.columns(2)
+    col1.metric("Reported Diagnosis", _format_percentage(similar["prevalence"]))
+    col2.metric("Cases", f"{similar['cases']} of {similar['total']}")
+
+
+@traced()
+@profiled()
 def convert_api_response_to_display_format(api_response, recommendations_config=None):
     """
     Convert API response (snake_case format) to display format for frontend.
@@ -602,6 +627,10 @@ def display_results():
                 st.session_state.risk_scores,
                 st.session_state.comparison_data_by_disease
             )
+            _display_similar_individuals(
+                selected_disease,
+                st.session_state.get("similar_individuals", {})
+            )
     
     return True
 
@@ -0,0 +1,57 @@
+from statistics import NormalDist
+
+import numpy as np
+
+# Resamples per cell for bootstrap intervals
+BOOTSTRAP_RESAMPLES = 2000
+
+# Upper bound on cells x resamples drawn in one call; beyond it every cell
+# falls back to the analytic Wilson interval
+MAX_BOOTSTRAP_DRAWS = 5_000_000
+
+
+def wilson_interval(cases, totals, confidence=0.95):
+    """Return (low, high) Wilson score intervals for proportions, as arrays in 0..1."""
+    cases = np.asarray(cases, dtype=np.float64)
+    totals = np.asarray(totals, dtype=np.float64)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = cases / totals
+        denom = 1 + z ** 2 / totals
+        center = (p + z ** 2 / (2 * totals)) / denom
+        half = z * np.sqrt(p * (1 - p) / totals + z ** 2 / (4 * totals ** 2)) / denom
+    return np.clip(center - half, 0.0, 1.0), np.clip(center + half, 0.0, 1.0)
+
+
+def prevalence_intervals(cases, totals, confidence=0.95, n_resamples=BOOTSTRAP_RESAMPLES, seed=0):
+    """
+    Percentile-bootstrap intervals for many prevalence cells at once.
+
+    Resampling n respondents with replacement from a cell with k cases gives
+    a Binomial(n, k/n) case count, so all cells are resampled in one
+    vectorized draw of shape (cells, n_resamples) with a fixed seed. Cells
+    whose estimate is 0 or 1 (where the bootstrap collapses to a point) use
+    the Wilson interval, as do all cells when the draw would exceed
+    MAX_BOOTSTRAP_DRAWS.
+
+    Returns (low, high, method) arrays; bounds are proportions in 0..1 and
+    method is "bootstrap" or "wilson" per cell.
+    """
+    cases = np.asarray(cases, dtype=np.int64)
+    totals = np.asarray(totals, dtype=np.int64)
+    low, high = wilson_interval(cases, totals, confidence)
+    method = np.full(len(cases), "wilson", dtype=object)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = cases / totals
+    use_bootstrap = (totals > 0) & (p > 0) & (p < 1)
+    if not use_bootstrap.any() or use_bootstrap.sum() * n_resamples > MAX_BOOTSTRAP_DRAWS:
+        return low, high, method
+
+    rng = np.random.default_rng(seed)
+    n = totals[use_bootstrap]
+    draws = rng.binomial(n[:, None], p[use_bootstrap][:, None], size=(len(n), n_resamples)) / n[:, None]
+    tail = (1 - confidence) / 2 * 100
+    low[use_bootstrap], high[use_bootstrap] = np.percentile(draws, [tail, 100 - tail], axis=1)
+    method[use_bootstrap] = "bootstrap"
+    return low, high, method
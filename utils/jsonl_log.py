@@ -0,0 +1,44 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+_lock = threading.Lock()
+
+
+def append_jsonl(path, record, max_bytes, backups=1):
+    """
+    Append one JSON record to a rolling JSON-lines file.
+
+    When the file has grown past `max_bytes` it is rotated first:
+    `name` -> `name.1` -> ... -> `name.<backups>`, dropping the oldest.
+    Write errors are swallowed; diagnostics must never break a page.
+    """
+    path = Path(path)
+    line = json.dumps(record, default=str) + "\n"
+    try:
+        with _lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists() and path.stat().st_size > max_bytes:
+                for index in range(backups, 0, -1):
+                    source = path if index == 1 else path.with_name(f"{path.name}.{index - 1}")
+                    if source.exists():
+                        os.replace(source, path.with_name(f"{path.name}.{index}"))
+            with open(path, "a") as handle:
+                handle.write(line)
+    except OSError:
+        pass
+
+
+def read_jsonl(paths):
+    """Yield records from JSON-lines files in order, skipping lines that do not parse."""
+    for path in paths:
+        path = Path(path)
+        if not path.exists():
+            continue
+        with open(path) as handle:
+            for line in handle:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
@@ -0,0 +1,332 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Exposition is opt-in: METRICS_PORT serves Prometheus text on
+# http://127.0.0.1:<port>/metrics, METRICS_FILE is rewritten after each
+# recorded backend call (for a textfile collector or a local stand-in)
+METRICS_PORT = os.getenv("METRICS_PORT")
+METRICS_FILE = os.getenv("METRICS_FILE")
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class: a named metric with one series per combination of label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            series = sorted(self._series.items())
+        if not series and not self.labelnames:
+            # An unlabelled metric exists from the start, so expose its zero value
+            series = [((), self._zero())]
+        for key, value in series:
+            lines.extend(self._render_series(key, value))
+        return lines
+
+    def _zero(self):
+        return 0
+
+    def _render_series(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._series.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels):
+        return self._series.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """
+    Fixed-bucket histogram.
+
+    Each series keeps a count per bucket plus the sum and count of all
+    observations, so recording is O(log buckets) and memory stays constant.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = self._zero()
+            series["buckets"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self, **labels):
+        """Return (bucket upper bounds, cumulative counts, sum, count) for one series."""
+        series = self._series.get(self._key(labels)) or self._zero()
+        cumulative = []
+        running = 0
+        for count in series["buckets"]:
+            running += count
+            cumulative.append(running)
+        return self.buckets + (float("inf"),), cumulative, series["sum"], series["count"]
+
+    def _zero(self):
+        return {"buckets": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+
+    def _render_series(self, key, series):
+        lines = []
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), series["buckets"]):
+            running += count
+            labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+            lines.append(f"{self.name}_bucket{labels} {running}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+        lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide collection of metrics, shared by every Streamlit session."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                # Pages are re-executed on every rerun; reuse the first definition
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path):
+        """Atomically write the exposition text to `path`."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.render())
+        os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+_exporter_lock = threading.Lock()
+_exporter = None
+
+
+def start_exporter(port=METRICS_PORT, registry=REGISTRY):
+    """
+    Serve the registry at http://127.0.0.1:<port>/metrics from a daemon thread.
+
+    Does nothing without a port, and only starts once per process.
+    """
+    global _exporter
+    if not port:
+        return None
+    with _exporter_lock:
+        if _exporter is not None:
+            return _exporter
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", int(port)), _Handler)
+        except OSError:
+            # Another worker process already serves this port
+            return None
+        threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+        _exporter = server
+        return server
+
+
+def export_metrics(registry=REGISTRY):
+    """Rewrite METRICS_FILE (if configured) with the current values."""
+    if not METRICS_FILE:
+        return
+    try:
+        registry.write_file(METRICS_FILE)
+    except OSError:
+        pass
+
+
+# Application metrics
+BACKEND_REQUESTS = REGISTRY.counter(
+    "backend_requests_total",
+    "Prediction backend calls by endpoint, outcome (ok, http_error, timeout, connection_error, error) and status code.",
+    ("endpoint", "outcome", "status")
+)
+BACKEND_LATENCY = REGISTRY.histogram(
+    "backend_request_duration_seconds",
+    "Prediction backend call latency by endpoint and outcome.",
+    ("endpoint", "outcome")
+)
+BACKEND_COALESCED = REGISTRY.counter(
+    "backend_requests_coalesced_total",
+    "Prediction calls answered by an identical request already in flight instead of a backend call.",
+    ("endpoint",)
+)
+BACKEND_IN_FLIGHT = REGISTRY.gauge(
+    "backend_requests_in_flight",
+    "Prediction backend calls currently admitted and running."
+)
+BACKEND_QUEUE_DEPTH = REGISTRY.gauge(
+    "backend_queue_depth",
+    "Prediction calls waiting for admission."
+)
+ADMISSION_LIMITS = REGISTRY.gauge(
+    "backend_admission_limit",
+    "Configured admission limits toward the backend (max_concurrency, rate_per_second, burst, queue_size).",
+    ("limit",)
+)
+ADMISSION_REJECTIONS = REGISTRY.counter(
+    "backend_admission_rejections_total",
+    "Prediction calls turned away by admission control, by reason (queue_full, queue_timeout).",
+    ("reason",)
+)
+QUEUE_WAIT = REGISTRY.histogram(
+    "backend_queue_wait_seconds",
+    "Time prediction calls spent waiting for admission."
+)
+CIRCUIT_STATE = REGISTRY.gauge(
+    "backend_circuit_state",
+    "Prediction backend circuit breaker state: 0 closed, 1 half-open, 2 open."
+)
+CIRCUIT_REJECTIONS = REGISTRY.counter(
+    "backend_circuit_rejections_total",
+    "Prediction calls failed fast by the circuit breaker without calling the backend."
+)
+BACKEND_READ_TIMEOUT = REGISTRY.gauge(
+    "backend_read_timeout_seconds",
+    "Current adaptive read timeout for prediction backend calls."
+)
+SUBMIT_LATENCY = REGISTRY.histogram(
+    "submit_to_result_duration_seconds",
+    "Time from a form submit to stored results, by page.",
+    ("page",)
+)
+CONVERSION_LATENCY = REGISTRY.histogram(
+    "response_conversion_duration_seconds",
+    "Time to convert a backend response into display data, by page.",
+    ("page",)
+)
+VALIDATION_FAILURES = REGISTRY.counter(
+    "form_validation_failures_total",
+    "Submits rejected because required fields were missing."
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "cache_lookups_total",
+    "Dataset cache lookups by cache and result (hit or miss).",
+    ("cache", "result")
+)
@@ -0,0 +1,74 @@
+"""
+Patient fixtures for exercising the prediction backend.
+
+Each fixture is the `input_data` of a /prediction/all request. They start from
+the same adult and change what matters for the profile, so together they hit
+the backend's full and partial model routes.
+"""
+
+_BASE_PATIENT = {
+    "RIDAGEYR": 45,
+    "RIAGENDR": 2,
+    "RIDRETH3": 3,
+    "BMXHT": 165.0,
+    "BMXWT": 62.0,
+    "BMXBMI": 22.8,
+    "BMXWAIST": 80.0,
+    "ALQ121": 18,
+    "SMQ020": 2,
+    "SMQ040": None,
+    "PAD680": 300,
+    "OSQ230": 2,
+    "MCQ500": 2,
+    "MCQ160D": 2,
+    "MCQ160P": 2,
+    "MCQ160A": 2,
+    "INDFMPIR": 3.0,
+    "BPXSY1": 114.0,
+    "BPXDI1": 72.0,
+    "BPXSY2": 112.0,
+    "BPXDI2": 70.0,
+    "BPXSY3": 113.0,
+    "BPXDI3": 71.0,
+    "LBXGH": 5.2,
+    "LBXGLU": 88.0,
+    "LBXTC": 175.0,
+    "LBDHDD": 62.0,
+    "LBDLDL": 95.0,
+    "LBXSTR": 90.0,
+    "LBXSUA": 4.6,
+    "LBXSATSI": 18.0,
+    "LUXCAPM": 3600
+}
+
+_LAB_FIELDS = ("LBXGH", "LBXGLU", "LBXTC", "LBDHDD", "LBDLDL", "LBXSTR", "LBXSUA", "LBXSATSI", "LUXCAPM")
+
+
+def _patient(**overrides):
+    patient = dict(_BASE_PATIENT)
+    patient.update(overrides)
+    return patient
+
+
+PATIENT_FIXTURES = {
+    "healthy": _patient(),
+    "pre-diabetic": _patient(
+        RIDAGEYR=52, RIAGENDR=1, BMXWT=92.0, BMXHT=178.0, BMXBMI=29.0, BMXWAIST=104.0,
+        LBXGH=6.1, LBXGLU=112.0, LBXSTR=185.0, LBDHDD=41.0, PAD680=540
+    ),
+    "hypertensive": _patient(
+        RIDAGEYR=63, RIAGENDR=1, BMXBMI=27.5, BMXWAIST=98.0, SMQ020=1, SMQ040=1,
+        BPXSY1=158.0, BPXDI1=96.0, BPXSY2=155.0, BPXDI2=94.0, BPXSY3=157.0, BPXDI3=95.0
+    ),
+    # Questionnaire and exam only, as when the user skips the optional lab section
+    "partial-labs": _patient(**{field: None for field in _LAB_FIELDS}),
+    # Prior diagnoses reported, which routes diabetes and hypertension differently
+    "history-flags": _patient(
+        RIDAGEYR=71, DIQ010=1, BPQ020=1, MCQ160D=1, MCQ160A=1, MCQ500=1, SMQ020=1, SMQ040=3
+    )
+}
+
+
+def fixture_payload(name):
+    """Return the /prediction/all request body for a fixture."""
+    return {"input_data": dict(PATIENT_FIXTURES[name])}
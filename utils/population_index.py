@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.constants import AGE_GROUP_BINS, AGE_GROUP_LABELS, GENDER_MAP
+from utils.dataset_store import DATA_DIR
+
+# NHANES participants scored by the backend: RIDAGEYR, RIAGENDR and one
+# risk column (0-100) per disease type. Generate it with
+# benchmarks/score_population.py; without it no comparison is filled in
+POPULATION_SCORES_PATH = DATA_DIR / "population_risk_scores.csv"
+
+DISEASE_TYPES = ["ckd", "diabetes", "hypertension", "cvd"]
+
+# Inner edges of AGE_GROUP_BINS; intervals are right-closed like pd.cut
+_AGE_EDGES = np.asarray(AGE_GROUP_BINS[1:-1], dtype=float)
+
+
+def age_group_index(ages):
+    """Map ages to positions in AGE_GROUP_LABELS (same bands as the statistics page)."""
+    return np.searchsorted(_AGE_EDGES, np.asarray(ages, dtype=float), side="left")
+
+
+class PopulationIndex:
+    """
+    Per-stratum sorted risk scores for instant population comparison.
+
+    Strata are age group x gender. Each stratum keeps its scores sorted along
+    with their mean and standard deviation, so a percentile lookup is a
+    binary search and the summary statistics are precomputed.
+    """
+
+    def __init__(self, ages, genders, scores_by_disease):
+        ages = np.asarray(ages, dtype=float)
+        genders = np.asarray(genders, dtype=float)
+        known = ~np.isnan(ages) & np.isin(genders, list(GENDER_MAP))
+        strata = age_group_index(ages) * 10 + np.nan_to_num(genders).astype(np.int64)
+
+        self._strata = {}
+        for disease, scores in scores_by_disease.items():
+            scores = np.asarray(scores, dtype=float)
+            valid = known & ~np.isnan(scores)
+            s_strata = strata[valid]
+            s_scores = scores[valid]
+            # Sort by stratum, then score, and cut the result into per-stratum runs
+            order = np.lexsort((s_scores, s_strata))
+            s_strata = s_strata[order]
+            s_scores = s_scores[order]
+            keys, starts = np.unique(s_strata, return_index=True)
+            ends = np.append(starts[1:], len(s_strata))
+            for key, start, end in zip(keys, starts, ends):
+                run = s_scores[start:end]
+                self._strata[(disease, int(key))] = (run, float(run.mean()), float(run.std()))
+
+    @classmethod
+    def from_dataframe(cls, df, disease_types=DISEASE_TYPES):
+        """Build an index from a DataFrame of scored participants."""
+        scores = {d: df[d].to_numpy() for d in disease_types if d in df.columns}
+        return cls(df["RIDAGEYR"].to_numpy(), df["RIAGENDR"].to_numpy(), scores)
+
+    def compare(self, disease_type, risk_score, age, gender):
+        """
+        Return a `population_comparison` block in the backend's format, or None
+        if the stratum has no scored participants.
+        """
+        if age is None or gender not in GENDER_MAP:
+            return None
+        group = int(age_group_index([age])[0])
+        entry = self._strata.get((disease_type, group * 10 + int(gender)))
+        if entry is None:
+            return None
+
+        scores, mean, std = entry
+        below = np.searchsorted(scores, float(risk_score), side="left")
+        return {
+            "age_range": AGE_GROUP_LABELS[group],
+            "gender": GENDER_MAP[int(gender)],
+            "user_risk": risk_score,
+            "population_mean": round(mean, 2),
+            "population_std_dev": round(std, 2),
+            "percentile": round(float(below) / len(scores) * 100, 2),
+            "sample_size": len(scores),
+        }
+
+
+@st.cache_resource(show_spinner=False)
+def _load_index(path, mtime_ns):
+    return PopulationIndex.from_dataframe(pd.read_csv(path))
+
+
+def load_population_index(path=POPULATION_SCORES_PATH):
+    """Return the cached population index, or None if no scored file exists."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return _load_index(str(path), path.stat().st_mtime_ns)
@@ -0,0 +1,141 @@
+import contextvars
+import functools
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from utils.jsonl_log import append_jsonl
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Profiling is opt-in: set APP_PROFILE=1 for every session, or open a page with ?profile=1
+PROFILE_ENV = "APP_PROFILE"
+PROFILE_QUERY_PARAM = "profile"
+
+# Every profiled rerun is appended to this JSON-lines log; when it grows past
+# PROFILE_LOG_MAX_BYTES it is rotated to `<name>.1` (one backup is kept)
+PROFILE_LOG_PATH = Path(os.getenv("PROFILE_LOG_PATH", str(PROJECT_ROOT / "logs" / "profile.jsonl")))
+PROFILE_LOG_MAX_BYTES = int(os.getenv("PROFILE_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+
+_RUN_KEY = "_profile_run"
+_TRUTHY = ("1", "true", "yes")
+
+# The run being timed in this script thread, set by `start_run()`. Stages check
+# it instead of session state so they cost next to nothing when profiling is off
+_current_run = contextvars.ContextVar("profile_run", default=None)
+
+
+def profiling_requested():
+    """Return True if profiling is enabled by the environment or the page URL."""
+    if os.getenv(PROFILE_ENV, "").lower() in _TRUTHY:
+        return True
+    return str(st.query_params.get(PROFILE_QUERY_PARAM, "")).lower() in _TRUTHY
+
+
+def start_run(page):
+    """
+    Begin timing a rerun of `page`. Call once at the top of the page script.
+
+    A previous rerun that never reached `render_profile_panel()` (typically
+    because it ended with `st.rerun()`) is logged here and kept so the panel
+    can show it next to the current rerun.
+    """
+    previous = st.session_state.get(_RUN_KEY)
+    interrupted = None
+    if previous is not None and not previous["flushed"] and previous["stages"]:
+        previous["interrupted"] = True
+        previous["previous"] = None
+        _append_log(previous)
+        interrupted = previous
+
+    if not profiling_requested():
+        st.session_state[_RUN_KEY] = None
+        _current_run.set(None)
+        return
+    run = {
+        "page": page,
+        "timestamp": time.time(),
+        "start": time.perf_counter(),
+        "stages": [],
+        "flushed": False,
+        "interrupted": False,
+        "previous": interrupted
+    }
+    st.session_state[_RUN_KEY] = run
+    _current_run.set(run)
+
+
+@contextmanager
+def stage(name):
+    """Time a block as a named stage of the current rerun; a no-op unless profiling."""
+    run = _current_run.get()
+    if run is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run["stages"].append([name, (time.perf_counter() - start) * 1000])
+
+
+def profiled(name=None):
+    """Decorator form of `stage()`; the stage defaults to the function's name."""
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_run.get() is None:
+                return func(*args, **kwargs)
+            with stage(stage_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _stage_table(run):
+    timings = pd.DataFrame(run["stages"], columns=["Stage", "Time (ms)"])
+    table = timings.groupby("Stage", sort=False)["Time (ms)"].agg(["count", "sum"]).reset_index()
+    table.columns = ["Stage", "Calls", "Time (ms)"]
+    table["Time (ms)"] = table["Time (ms)"].round(2)
+    return table
+
+
+def _log_record(run):
+    return {
+        "timestamp": run["timestamp"],
+        "page": run["page"],
+        "total_ms": round(run["total_ms"], 3) if "total_ms" in run else None,
+        "interrupted": run["interrupted"],
+        "stages": [[name, round(ms, 3)] for name, ms in run["stages"]]
+    }
+
+
+def _append_log(run):
+    append_jsonl(PROFILE_LOG_PATH, _log_record(run), PROFILE_LOG_MAX_BYTES)
+
+
+def render_profile_panel():
+    """Show the per-stage breakdown of this rerun in the sidebar and log it. Call at the end of the page script."""
+    run = _current_run.get()
+    if run is None:
+        return
+    _current_run.set(None)
+    run["total_ms"] = (time.perf_counter() - run["start"]) * 1000
+    run["flushed"] = True
+    _append_log(run)
+
+    with st.sidebar.expander("⏱️ Rerun Profile", expanded=True):
+        st.caption(f"This rerun: {run['total_ms']:.1f} ms")
+        if run["stages"]:
+            st.dataframe(_stage_table(run), use_container_width=True, hide_index=True)
+        previous = run.get("previous")
+        if previous is not None:
+            st.caption("Previous rerun (ended by st.rerun)")
+            st.dataframe(_stage_table(previous), use_container_width=True, hide_index=True)
+        st.caption(f"Logged to {PROFILE_LOG_PATH}")
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from utils.constants import AGE_GROUP_BINS, GENDER_MAP
+
+
+def stratum_codes(frame):
+    """
+    Return one integer stratum per row: gender x age group.
+
+    Rows with a missing or unknown gender or age fall into strata of their
+    own rather than being dropped, so the sample still represents them.
+    """
+    codes = np.zeros(len(frame), dtype=np.int64)
+    if 'RIAGENDR' in frame.columns:
+        genders = pd.Categorical(frame['RIAGENDR'], categories=list(GENDER_MAP)).codes
+        codes = codes * (len(GENDER_MAP) + 1) + (np.asarray(genders, dtype=np.int64) + 1)
+    if 'RIDAGEYR' in frame.columns:
+        groups = pd.cut(frame['RIDAGEYR'], bins=AGE_GROUP_BINS, labels=False).to_numpy(dtype=float)
+        groups = np.nan_to_num(groups, nan=-1).astype(np.int64)
+        codes = codes * len(AGE_GROUP_BINS) + (groups + 1)
+    return codes
+
+
+def stratified_sample(codes, size, seed=0):
+    """
+    Draw a reproducible stratified sample of about `size` row indices.
+
+    Each stratum gets a share of the sample proportional to its size
+    (at least one row), and rows are picked within a stratum by a seeded
+    random key, so the same data and size always give the same sample.
+    Returns sorted row indices.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    n = len(codes)
+    if size >= n:
+        return np.arange(n)
+
+    strata, inverse, counts = np.unique(codes, return_inverse=True, return_counts=True)
+    quotas = np.maximum(np.round(counts * (size / n)).astype(np.int64), 1)
+
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(n), inverse))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    ranks = np.arange(n) - starts[inverse[order]]
+    return np.sort(order[ranks < quotas[inverse[order]]])
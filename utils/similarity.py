@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.constants import DISEASE_LABELS
+from utils.dataset_store import DATASET_PATH, arrow_cache_path, load_table
+
+# Numeric features compared between a user and NHANES participants
+SIMILARITY_FEATURES = [
+    "RIDAGEYR",  # Age
+    "BMXBMI",    # BMI
+    "BMXWAIST",  # Waist circumference
+    "BPXSY1",    # Systolic BP
+    "BPXDI1",    # Diastolic BP
+    "LBXGH",     # HbA1c
+    "LBXGLU",    # Fasting glucose
+    "LBXSTR",    # Triglycerides
+    "LUXCAPM",   # FVC
+    "LBDLDL",    # LDL cholesterol
+    "LBDHDD",    # HDL cholesterol
+    "LBXTC",     # Total cholesterol
+    "LBXSATSI",  # ALT
+    "LBXSUA",    # Uric acid
+]
+
+# Rows per distance block; bounds the size of temporary arrays
+BLOCK_SIZE = 65536
+
+
+class SimilarityIndex:
+    """
+    k-nearest-neighbour search over standardized NHANES features.
+
+    Lab values are often missing, so distances use only the features present
+    in both the query and the participant and are rescaled to the number of
+    query features (the "nan-euclidean" distance). Participants sharing fewer
+    than `min_overlap` features with the query are skipped.
+    """
+
+    def __init__(self, features, outcomes, min_overlap=3):
+        # A feature nobody has a value for has no mean to standardize against
+        features = features.loc[:, features.notna().any()]
+        self.feature_names = list(features.columns)
+        values = features.to_numpy(dtype=np.float64)
+        self._mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        self._std = np.where(std > 0, std, 1.0)
+
+        z = (values - self._mean) / self._std
+        self._present = ~np.isnan(z)
+        self._z = np.where(self._present, z, 0.0).astype(np.float32)
+        self._outcomes = outcomes.reset_index(drop=True)
+        self._raw = features.reset_index(drop=True)
+        self.min_overlap = min_overlap
+
+    def __len__(self):
+        return len(self._z)
+
+    def query(self, user_features, k=25):
+        """Return the k nearest participants with their features, outcomes and distance."""
+        cols = []
+        q = []
+        for idx, name in enumerate(self.feature_names):
+            value = user_features.get(name)
+            if value is not None and not pd.isna(value):
+                cols.append(idx)
+                q.append((float(value) - self._mean[idx]) / self._std[idx])
+        if len(cols) < self.min_overlap:
+            return None
+
+        q = np.asarray(q, dtype=np.float32)
+        n_query = len(cols)
+        best_dist = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+
+        for start in range(0, len(self._z), BLOCK_SIZE):
+            z = self._z[start:start + BLOCK_SIZE, cols]
+            present = self._present[start:start + BLOCK_SIZE, cols]
+            diff = (z - q) * present
+            overlap = present.sum(axis=1)
+            d2 = np.einsum("ij,ij->i", diff, diff)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                dist = np.sqrt(d2 * (n_query / overlap))
+            dist[overlap < self.min_overlap] = np.inf
+
+            # Keep only this block's top k before merging with the running best
+            if len(dist) > k:
+                top = np.argpartition(dist, k)[:k]
+            else:
+                top = np.arange(len(dist))
+            best_dist = np.concatenate([best_dist, dist[top]])
+            best_rows = np.concatenate([best_rows, top + start])
+            if len(best_dist) > k:
+                keep = np.argpartition(best_dist, k)[:k]
+                best_dist = best_dist[keep]
+                best_rows = best_rows[keep]
+
+        finite = np.isfinite(best_dist)
+        best_dist = best_dist[finite]
+        best_rows = best_rows[finite]
+        order = np.argsort(best_dist)
+
+        neighbors = pd.concat(
+            [self._raw.iloc[best_rows[order]], self._outcomes.iloc[best_rows[order]]],
+            axis=1
+        ).reset_index(drop=True)
+        neighbors["distance"] = best_dist[order]
+        return neighbors
+
+
+def summarize_outcomes(neighbors):
+    """Return {disease_key: {cases, total, prevalence}} among the neighbours (1=Yes, 2=No)."""
+    summary = {}
+    if neighbors is None:
+        return summary
+    for disease_key, disease_info in DISEASE_LABELS.items():
+        col_name = disease_info['col']
+        if col_name not in neighbors.columns:
+            continue
+        valid = neighbors[col_name].isin([1, 2])
+        total = int(valid.sum())
+        if total == 0:
+            continue
+        cases = int((neighbors[col_name] == 1).sum())
+        summary[disease_key] = {
+            "cases": cases,
+            "total": total,
+            "prevalence": cases / total * 100
+        }
+    return summary
+
+
+@st.cache_resource(show_spinner=False)
+def _build_index(csv_path, mtime_ns):
+    table = load_table(csv_path)
+    columns = set(table.column_names)
+    features = [c for c in SIMILARITY_FEATURES if c in columns]
+    outcomes = [d['col'] for d in DISEASE_LABELS.values() if d['col'] in columns]
+    frame = table.select(features + outcomes).to_pandas()
+    return SimilarityIndex(frame[features], frame[outcomes])
+
+
+def load_similarity_index(csv_path=DATASET_PATH):
+    """Return the cached similarity index, or None if the dataset is unavailable."""
+    try:
+        table = load_table(csv_path)
+    except OSError:
+        return None
+    if "RIDAGEYR" not in table.column_names:
+        return None
+    return _build_index(str(csv_path), arrow_cache_path(csv_path).stat().st_mtime_ns)
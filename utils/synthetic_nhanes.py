@@ -0,0 +1,298 @@
+"""
+Synthetic NHANES-shaped data for scale and load testing.
+
+Rows are drawn from a small generative model rather than resampled from the
+real files: age, gender and BMI drive blood pressure, glycemia, lipids and
+the self-reported diagnoses, so marginals, cross-column correlations and
+the survey's skip patterns (questions only asked of adults or of smokers,
+fasting-subsample labs, missing exams) look like the real data.
+
+    python -m utils.synthetic_nhanes --rows 1000000 --output data/nhanes_2091_2092_master.csv
+
+A file named like a cycle (nhanes_YYYY_YYYY_master.csv) in data/ shows up
+on the Dataset Statistics page like any real cycle.
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.ipc as ipc
+
+from utils.constants import OPTIONAL_FEATURE_SET, RACE_MAP, REQUIRED_FEATURE_SET
+
+# Rows generated per batch; bounds peak memory when writing large files
+BATCH_ROWS = 250_000
+
+# Age distribution: (low, high, share); 80 is the NHANES top code for 80+
+AGE_BANDS = ((1, 19, 0.30), (20, 39, 0.24), (40, 59, 0.24), (60, 79, 0.18), (80, 80, 0.04))
+
+RACE_CODES = np.array(sorted(RACE_MAP.values()))
+RACE_SHARES = np.array([0.11, 0.09, 0.34, 0.22, 0.11, 0.13])
+
+# Share of respondents with no exam (body measures, blood pressure) or no lab draw
+EXAM_MISSING_RATE = 0.07
+LAB_MISSING_RATE = 0.25
+# Share of lab respondents in the morning fasting subsample (glucose, LDL, triglycerides)
+FASTING_SUBSAMPLE_RATE = 0.45
+# Scattered item non-response on top of the structural skip patterns
+ITEM_MISSING_RATE = 0.02
+# Share of questionnaire answers coded 7 (refused) or 9 (don't know)
+REFUSED_RATE = 0.004
+
+ALCOHOL_DAYS = np.array([0, 10, 18, 42, 130, 240, 300])
+ALCOHOL_SHARES = np.array([0.28, 0.20, 0.14, 0.14, 0.12, 0.06, 0.06])
+
+DISEASE_COLUMNS = ["DIQ010", "BPQ020", "MCQ160B", "MCQ220"]
+
+COLUMNS = (
+    ["SEQN", "RIDAGEYR", "RIAGENDR", "RIDRETH3"]
+    + sorted((REQUIRED_FEATURE_SET | OPTIONAL_FEATURE_SET | set(DISEASE_COLUMNS)) - {"RIDAGEYR", "RIAGENDR", "RIDRETH3"})
+    + ["WTMEC2YR", "SDMVSTRA"]
+)
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _yes_no(rng, logit):
+    """Draw NHANES yes/no codes (1=Yes, 2=No) with P(yes) = sigmoid(logit)."""
+    return np.where(rng.random(logit.shape) < _sigmoid(logit), 1.0, 2.0)
+
+
+def _ages(rng, n):
+    shares = np.array([band[2] for band in AGE_BANDS])
+    band = rng.choice(len(AGE_BANDS), size=n, p=shares / shares.sum())
+    low = np.array([b[0] for b in AGE_BANDS])[band]
+    high = np.array([b[1] for b in AGE_BANDS])[band]
+    return np.floor(low + rng.random(n) * (high - low + 1))
+
+
+def generate_columns(n_rows, rng, first_seqn=0):
+    """
+    Return {column: ndarray} for `n_rows` synthetic respondents.
+
+    Coded answers and measurements are float64 with NaN for "not asked" or
+    missing, like the real CSVs; SEQN, RIDAGEYR, RIAGENDR, RIDRETH3 and
+    SDMVSTRA are always present and integral.
+    """
+    n = n_rows
+    age = _ages(rng, n)
+    male = rng.random(n) < 0.49
+    adult = age >= 20
+    adult_age = np.maximum(age - 20, 0)
+    noise = lambda scale: rng.standard_normal(n) * scale
+
+    # Body measures: BMI rises through childhood, then drifts up into middle age
+    bmi_base = np.where(adult, 26.5 + 0.06 * np.minimum(adult_age, 40), 15.5 + 0.55 * np.maximum(age - 5, 0))
+    bmi = np.maximum(bmi_base * np.exp(noise(0.2)), 12)
+    bmi_dev = bmi - 27
+    waist = np.maximum(np.where(adult, 2.3 * bmi + 28 + 5 * male, 2.4 * bmi + 8) + noise(6), 40)
+
+    # Blood pressure: age, adiposity and sex; repeated readings share the person's level
+    sbp = np.maximum(104 + 0.5 * adult_age + 0.7 * bmi_dev + 4 * male + np.where(adult, 0, -8) + noise(13), 70)
+    dbp = np.maximum(60 + 0.25 * np.minimum(adult_age, 30) + 0.3 * bmi_dev + 0.2 * (sbp - 120) + noise(8), 30)
+
+    # Glycemia: a right-skewed diabetic tail on top of the age/BMI trend
+    glycemic = 5.1 + 0.012 * adult_age + 0.035 * bmi_dev + noise(0.3)
+    diabetic_tail = rng.random(n) < _sigmoid(-3.4 + 0.04 * adult_age + 0.09 * bmi_dev)
+    hba1c = glycemic + diabetic_tail * rng.gamma(2.0, 0.9, n)
+    glucose = 28.7 * hba1c - 46.7 + noise(9)
+
+    # Lipids: LDL follows the Friedewald equation, so the four stay consistent
+    total_chol = np.maximum(150 + 0.9 * np.minimum(adult_age, 40) + 0.8 * bmi_dev + noise(34), 80)
+    hdl = np.maximum(60 - 0.7 * bmi_dev - 9 * male + noise(12), 15)
+    triglycerides = np.exp(np.log(105) + 0.025 * bmi_dev + 0.1 * male + noise(0.45))
+    ldl = np.maximum(total_chol - hdl - triglycerides / 5, 20)
+
+    alt = np.exp(np.log(19) + 0.02 * bmi_dev + 0.3 * male + noise(0.45))
+    uric_acid = np.maximum(4.6 + 1.3 * male + 0.09 * bmi_dev + noise(1.1), 1.5)
+    fvc = np.where(
+        adult,
+        np.where(male, 5000, 3600) - 28 * np.maximum(age - 30, 0),
+        np.where(male, 1000, 900) + 210 * np.maximum(age - 5, 0)
+    ) * np.exp(noise(0.12))
+    income_ratio = np.minimum(np.exp(np.log(2.1) + noise(0.7)), 5.0)
+
+    # Lifestyle questions are asked of adults; smoking frequency only of ever-smokers
+    smoked = np.where(rng.random(n) < np.where(male, 0.45, 0.33), 1.0, 2.0)
+    smoking_frequency = rng.choice(np.array([1.0, 2.0, 3.0]), size=n, p=[0.33, 0.1, 0.57])
+    alcohol_days = rng.choice(ALCOHOL_DAYS, size=n, p=ALCOHOL_SHARES).astype(float)
+    sedentary_minutes = np.clip(330 + 1.5 * adult_age + noise(170), 0, 1320)
+    smoker = smoked == 1.0
+
+    # Diagnoses follow the measured risk factors
+    diabetes = np.where(
+        rng.random(n) < _sigmoid(-5.0 + 3.0 * (hba1c - 5.2)),
+        1.0,
+        np.where(rng.random(n) < 0.12 * ((hba1c >= 5.7) & (hba1c < 6.5)), 3.0, 2.0)
+    )
+    hypertension = _yes_no(rng, -2.6 + 0.035 * (sbp - 120) + 0.045 * adult_age + 0.05 * bmi_dev)
+    cvd = _yes_no(rng, -6.2 + 0.065 * adult_age + 0.6 * male + 0.5 * smoker + 0.015 * (sbp - 120))
+    ckd = _yes_no(rng, -5.5 + 0.045 * adult_age + 0.8 * (diabetes == 1.0) + 0.6 * (hypertension == 1.0))
+    angina = _yes_no(rng, -6.0 + 0.055 * adult_age + 0.4 * male + 0.4 * smoker)
+    copd = _yes_no(rng, -5.6 + 0.03 * adult_age + 1.4 * smoker)
+    arthritis = _yes_no(rng, -3.6 + 0.06 * adult_age + 0.03 * bmi_dev)
+    cancer = _yes_no(rng, -4.4 + 0.055 * adult_age)
+    metal_objects = _yes_no(rng, -3.2 + 0.03 * adult_age)
+
+    columns = {
+        "SEQN": np.arange(first_seqn, first_seqn + n),
+        "RIDAGEYR": age.astype(np.int64),
+        "RIAGENDR": np.where(male, 1, 2),
+        "RIDRETH3": rng.choice(RACE_CODES, size=n, p=RACE_SHARES / RACE_SHARES.sum()),
+        "BMXBMI": bmi,
+        "BMXWAIST": waist,
+        "BPXSY1": sbp + noise(3),
+        "BPXSY2": sbp + noise(3),
+        "BPXSY3": sbp + noise(3),
+        "BPXSY4": sbp + noise(3),
+        "BPXDI1": dbp + noise(2.5),
+        "BPXDI2": dbp + noise(2.5),
+        "BPXDI3": dbp + noise(2.5),
+        "BPXDI4": dbp + noise(2.5),
+        "LBXGH": hba1c,
+        "LBXGLU": glucose,
+        "LBXTC": total_chol,
+        "LBDHDD": hdl,
+        "LBDLDL": ldl,
+        "LBXSTR": triglycerides,
+        "LBXSATSI": alt,
+        "LBXSUA": uric_acid,
+        "LUXCAPM": fvc,
+        "INDFMPIR": income_ratio,
+        "SMQ020": smoked,
+        "SMQ040": smoking_frequency,
+        "ALQ121": alcohol_days,
+        "PAD680": sedentary_minutes,
+        "DIQ010": diabetes,
+        "BPQ020": hypertension,
+        "MCQ160B": cvd,
+        "MCQ220": ckd,
+        "MCQ160D": angina,
+        "MCQ160P": copd,
+        "MCQ160A": arthritis,
+        "MCQ500": cancer,
+        "OSQ230": metal_objects,
+        "WTMEC2YR": np.exp(np.log(32000) + noise(0.65)),
+        "SDMVSTRA": rng.integers(1, 15, size=n)
+    }
+    _apply_missingness(columns, rng, age)
+    return columns
+
+
+# Structural skip patterns: (columns, minimum age asked)
+_ASKED_FROM_AGE = (
+    (["SMQ020", "ALQ121", "PAD680", "MCQ160B", "MCQ160D", "MCQ160P", "MCQ160A", "MCQ220", "MCQ500", "OSQ230"], 20),
+    (["BPQ020"], 16),
+    (["BPXSY1", "BPXSY2", "BPXSY3", "BPXSY4", "BPXDI1", "BPXDI2", "BPXDI3", "BPXDI4"], 8),
+    (["LBXGH", "LBXGLU", "LBXTC", "LBDHDD", "LBDLDL", "LBXSTR", "LBXSATSI", "LBXSUA"], 12),
+    (["LUXCAPM"], 6)
+)
+_EXAM_COLUMNS = ["BMXBMI", "BMXWAIST", "BPXSY1", "BPXSY2", "BPXSY3", "BPXSY4",
+                 "BPXDI1", "BPXDI2", "BPXDI3", "BPXDI4", "LUXCAPM"]
+_LAB_COLUMNS = ["LBXGH", "LBXGLU", "LBXTC", "LBDHDD", "LBDLDL", "LBXSTR", "LBXSATSI", "LBXSUA"]
+_FASTING_COLUMNS = ["LBXGLU", "LBDLDL", "LBXSTR"]
+_CODED_COLUMNS = ["SMQ020", "SMQ040", "DIQ010", "BPQ020", "MCQ160B", "MCQ220",
+                  "MCQ160D", "MCQ160P", "MCQ160A", "MCQ500", "OSQ230"]
+_ALWAYS_PRESENT = {"SEQN", "RIDAGEYR", "RIAGENDR", "RIDRETH3", "WTMEC2YR", "SDMVSTRA"}
+
+
+def _apply_missingness(columns, rng, age):
+    n = len(age)
+    no_exam = rng.random(n) < EXAM_MISSING_RATE
+    no_lab = no_exam | (rng.random(n) < LAB_MISSING_RATE)
+    not_fasting = no_lab | (rng.random(n) > FASTING_SUBSAMPLE_RATE)
+
+    for names, min_age in _ASKED_FROM_AGE:
+        for name in names:
+            columns[name][age < min_age] = np.nan
+    for name in _EXAM_COLUMNS:
+        columns[name][no_exam] = np.nan
+    for name in _LAB_COLUMNS:
+        columns[name][no_lab] = np.nan
+    for name in _FASTING_COLUMNS:
+        columns[name][not_fasting] = np.nan
+    # The fourth reading is only taken when an earlier one was unusable
+    for name in ("BPXSY4", "BPXDI4"):
+        columns[name][rng.random(n) < 0.92] = np.nan
+    # Smoking frequency is only asked of ever-smokers
+    columns["SMQ040"][columns["SMQ020"] != 1.0] = np.nan
+
+    for name in _CODED_COLUMNS:
+        values = columns[name]
+        refused = (rng.random(n) < REFUSED_RATE) & ~np.isnan(values)
+        values[refused] = np.where(rng.random(int(refused.sum())) < 0.3, 7.0, 9.0)
+    for name, values in columns.items():
+        if name not in _ALWAYS_PRESENT:
+            values[rng.random(n) < ITEM_MISSING_RATE] = np.nan
+
+
+def _round_measurements(columns):
+    for name, values in columns.items():
+        if values.dtype.kind == "f" and name not in _CODED_COLUMNS:
+            np.round(values, 2, out=values)
+
+
+def generate_batches(n_rows, seed=0, batch_rows=BATCH_ROWS):
+    """Yield pyarrow RecordBatches totalling `n_rows` rows; the same seed and batch size give the same data."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, batch_rows):
+        columns = generate_columns(min(batch_rows, n_rows - start), rng, first_seqn=start)
+        _round_measurements(columns)
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(columns[name], from_pandas=True) for name in COLUMNS], names=COLUMNS
+        )
+
+
+def generate_table(n_rows, seed=0, batch_rows=BATCH_ROWS):
+    """Return `n_rows` synthetic respondents as one pyarrow Table (NaN becomes null)."""
+    return pa.Table.from_batches(list(generate_batches(n_rows, seed, batch_rows)))
+
+
+def generate_dataframe(n_rows, seed=0, batch_rows=BATCH_ROWS):
+    """Return `n_rows` synthetic respondents as a pandas DataFrame shaped like the NHANES CSVs."""
+    return generate_table(n_rows, seed, batch_rows).to_pandas()
+
+
+def write_dataset(path, n_rows, seed=0, batch_rows=BATCH_ROWS):
+    """
+    Stream synthetic rows to `path`, batch by batch.
+
+    The format follows the suffix: .csv, or .arrow/.feather for an Arrow IPC file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    batches = generate_batches(n_rows, seed, batch_rows)
+    first = next(batches)
+    if path.suffix == ".csv":
+        writer = pv.CSVWriter(str(path), first.schema)
+    elif path.suffix in (".arrow", ".feather"):
+        writer = ipc.new_file(str(path), first.schema)
+    else:
+        raise ValueError(f"Unsupported output format '{path.suffix}' (use .csv, .arrow or .feather)")
+    with writer:
+        writer.write_batch(first)
+        for batch in batches:
+            writer.write_batch(batch)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic NHANES-shaped data for scale testing.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="number of respondents (default 1,000,000)")
+    parser.add_argument("--output", required=True, help="output path; .csv, .arrow or .feather")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default 0)")
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS, help=f"rows per batch (default {BATCH_ROWS})")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    path = write_dataset(args.output, args.rows, args.seed, args.batch_rows)
+    print(f"Wrote {args.rows:,} rows to {path} in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
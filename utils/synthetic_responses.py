@@ -0,0 +1,95 @@
+"""
+Synthetic /prediction/all responses for rendering stress tests.
+
+The shape follows the backend's response (see `_convert_api_to_frontend_format`):
+a `model_routing` block plus one entry per disease with its risk, SHAP factors
+and an optional population comparison.
+"""
+import random
+
+# Diseases the frontend has display names for; extra diseases get generic keys
+KNOWN_DISEASES = ("ckd", "diabetes", "hypertension", "cvd")
+
+# Feature codes used for SHAP factors, cycled through when more factors are requested
+SHAP_FEATURES = (
+    "RIDAGEYR", "RIAGENDR", "BMXBMI", "BMXWAIST", "BPXSY1", "BPXDI1", "LBXGH", "LBXGLU",
+    "LBDLDL", "LBXTC", "LBDHDD", "LBXSTR", "LBXSUA", "LBXSATSI", "LUXCAPM", "SMQ020",
+    "SMQ040", "ALQ121", "PAD680", "INDFMPIR", "DIQ010", "BPQ020", "MCQ160B", "MCQ220", "MCQ160A"
+)
+
+RECOMMENDATION_SENTENCES = (
+    "Discuss this result with your doctor at your next visit.",
+    "Small, steady changes to diet and activity tend to last longer than drastic ones.",
+    "Recheck this value in three to six months to see how it is trending.",
+    "Aim for at least 150 minutes of moderate activity spread across the week.",
+    "Limit processed foods, added sugar and salt where you can.",
+    "Bring a list of your current medications to your next appointment."
+)
+
+AGE_RANGES = ("20-30", "30-40", "40-50", "50-60", "60-70", "70-80", "80+")
+
+
+def disease_keys(n_diseases):
+    """Return the response keys for `n_diseases` diseases, known ones first."""
+    keys = list(KNOWN_DISEASES[:n_diseases])
+    keys.extend(f"disease_{i + 1}" for i in range(len(keys), n_diseases))
+    return keys
+
+
+def _recommendation(rng, sentences):
+    return " ".join(rng.choice(RECOMMENDATION_SENTENCES) for _ in range(sentences))
+
+
+def _shap_factors(rng, count, sign, recommendation_sentences):
+    factors = []
+    for i in range(count):
+        feature = SHAP_FEATURES[i % len(SHAP_FEATURES)]
+        factors.append({
+            # Past the feature list, suffix the code so every factor stays distinct
+            "feature": feature if i < len(SHAP_FEATURES) else f"{feature}_{i // len(SHAP_FEATURES)}",
+            "importance": sign * rng.uniform(0.001, 0.5),
+            "modifiable": rng.random() < 0.5,
+            "recommendation": _recommendation(rng, recommendation_sentences),
+            "value": round(rng.uniform(0, 200), 1)
+        })
+    return factors
+
+
+def generate_prediction_response(n_diseases=4, increasing_factors=5, decreasing_factors=5,
+                                 recommendation_sentences=1, population_comparison=True, seed=0):
+    """
+    Build a /prediction/all style response.
+
+    Args:
+        n_diseases: number of disease entries
+        increasing_factors, decreasing_factors: SHAP factors per disease in each direction
+        recommendation_sentences: length of every factor's recommendation, in sentences
+        population_comparison: include a `population_comparison` block per disease
+        seed: the same arguments and seed always give the same response
+    """
+    rng = random.Random(seed)
+    keys = disease_keys(n_diseases)
+    response = {"model_routing": {key: "full" for key in keys}}
+    for key in keys:
+        risk = rng.randint(0, 100)
+        entry = {
+            "prediction": int(risk >= 50),
+            "confidence": round(rng.uniform(0.5, 1.0), 3),
+            "risk": risk,
+            "shap": {
+                "increasing_risk": _shap_factors(rng, increasing_factors, 1, recommendation_sentences),
+                "decreasing_risk": _shap_factors(rng, decreasing_factors, -1, recommendation_sentences)
+            }
+        }
+        if population_comparison:
+            entry["population_comparison"] = {
+                "age_range": rng.choice(AGE_RANGES),
+                "gender": rng.choice(("Male", "Female")),
+                "user_risk": risk,
+                "population_mean": round(rng.uniform(5, 60), 2),
+                "population_std_dev": round(rng.uniform(2, 20), 2),
+                "percentile": rng.randint(1, 99),
+                "sample_size": rng.randint(100, 5000)
+            }
+        response[key] = entry
+    return response
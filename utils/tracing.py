@@ -0,0 +1,123 @@
+import contextvars
+import functools
+import os
+import secrets
+import time
+from contextlib import contextmanager
+
+from utils.jsonl_log import append_jsonl
+
+# Tracing is opt-in: set TRACE_LOG_PATH (e.g. logs/traces.jsonl) to append
+# finished spans there as JSON lines
+TRACE_LOG_PATH = os.getenv("TRACE_LOG_PATH", "")
+TRACE_LOG_MAX_BYTES = int(os.getenv("TRACE_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+
+# Sent with backend calls so backend logs can be joined on the trace id
+TRACE_ID_HEADER = "X-Trace-Id"
+
+# Streamlit ends a script run by raising these; they are not failures
+_CONTROL_FLOW_EXCEPTIONS = ("RerunException", "StopException")
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation of a trace; `attributes` may be added while it runs."""
+
+    def __init__(self, name, trace_id, parent_id=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.status = "ok"
+        self._start_time = time.time()
+        self._start = time.perf_counter()
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def to_dict(self, duration_ms):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self._start_time,
+            "duration_ms": round(duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes
+        }
+
+
+def tracing_enabled():
+    return bool(TRACE_LOG_PATH)
+
+
+@contextmanager
+def span(name, trace_id=None, parent_id=None, **attributes):
+    """
+    Time a block as a span and write it to the trace log when it ends.
+
+    Inside another span this becomes its child; otherwise it starts a new
+    trace, unless `trace_id` (and optionally `parent_id`) continue an
+    earlier one, e.g. a render on the rerun after a submit. Yields the Span,
+    or None when tracing is off.
+    """
+    if not tracing_enabled():
+        yield None
+        return
+    parent = _current_span.get()
+    if trace_id is None:
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id = secrets.token_hex(16)
+    current = Span(name, trace_id, parent_id, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        if type(e).__name__ not in _CONTROL_FLOW_EXCEPTIONS:
+            current.status = "error"
+            current.set_attribute("error", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        duration_ms = (time.perf_counter() - current._start) * 1000
+        append_jsonl(TRACE_LOG_PATH, current.to_dict(duration_ms), TRACE_LOG_MAX_BYTES)
+
+
+def traced(name=None):
+    """
+    Decorator that records a call as a child span of the active trace.
+
+    Calls made outside any trace are not recorded, so shared helpers can be
+    decorated without every caller starting traces.
+    """
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span():
+    return _current_span.get()
+
+
+def trace_headers():
+    """Headers that propagate the current trace: X-Trace-Id and a W3C traceparent."""
+    current = _current_span.get()
+    if current is None:
+        return {}
+    return {
+        TRACE_ID_HEADER: current.trace_id,
+        "traceparent": f"00-{current.trace_id}-{current.span_id}-01"
+    }
@@ -0,0 +1,124 @@
+import os
+import time
+from pathlib import Path
+
+from utils.constants import OPTIONAL_FEATURE_SET, REQUIRED_FEATURE_SET
+from utils.jsonl_log import append_jsonl, read_jsonl
+
+# Capture is opt-in: set CAPTURE_LOG_PATH to record every backend exchange as
+# a JSON line; the file rotates at CAPTURE_LOG_MAX_BYTES keeping CAPTURE_LOG_BACKUPS
+CAPTURE_LOG_PATH = os.getenv("CAPTURE_LOG_PATH", "")
+CAPTURE_LOG_MAX_BYTES = int(os.getenv("CAPTURE_LOG_MAX_BYTES", str(20 * 1024 * 1024)))
+CAPTURE_LOG_BACKUPS = int(os.getenv("CAPTURE_LOG_BACKUPS", "5"))
+
+# Only model features are kept from a request; anything else could identify the user.
+# Besides the form's features the backend also reads measured height/weight and
+# the alternative BP/lab codes the Test_API patient sends
+CAPTURED_FEATURES = REQUIRED_FEATURE_SET | OPTIONAL_FEATURE_SET | {"BMXHT", "BMXWT", "BPXOSY1", "LBDGLUSI", "LBDLDLSI"}
+
+# Ages are top-coded as in the public NHANES files
+AGE_TOP_CODE = 80
+
+# Response fields that describe the user rather than the prediction; the
+# population comparison repeats the user's age band and gender
+DROPPED_COMPARISON_FIELDS = ("age_range", "gender")
+
+
+def capture_enabled():
+    return bool(CAPTURE_LOG_PATH)
+
+
+def anonymize_request(payload):
+    """
+    Return a copy of a /prediction/all body that is safe to keep.
+
+    Fields other than model features are dropped and the age is top-coded.
+    The remaining values are kept as sent, so a replay reproduces the
+    backend's input.
+    """
+    input_data = payload.get("input_data") or {}
+    anonymized = {key: value for key, value in input_data.items() if key in CAPTURED_FEATURES}
+    if "RIDAGEYR" in anonymized:
+        anonymized["RIDAGEYR"] = _top_code_age(anonymized["RIDAGEYR"])
+    return {"input_data": anonymized}
+
+
+def anonymize_response(body):
+    """
+    Return a copy of a /prediction/all response that is safe to keep.
+
+    SHAP factors echo the submitted feature values, so they get the same
+    treatment as the request: the age is top-coded and values of features
+    the request would drop are removed. The user's age band and gender are
+    dropped from population comparisons. Apply it to replayed responses
+    too before comparing them with a capture.
+    """
+    if not isinstance(body, dict):
+        return body
+    anonymized = {}
+    for key, entry in body.items():
+        if isinstance(entry, dict):
+            entry = dict(entry)
+            shap = entry.get("shap")
+            if isinstance(shap, dict):
+                entry["shap"] = {
+                    direction: [_anonymize_factor(factor) for factor in factors] if isinstance(factors, list) else factors
+                    for direction, factors in shap.items()
+                }
+            comparison = entry.get("population_comparison")
+            if isinstance(comparison, dict):
+                entry["population_comparison"] = {
+                    field: value for field, value in comparison.items() if field not in DROPPED_COMPARISON_FIELDS
+                }
+        anonymized[key] = entry
+    return anonymized
+
+
+def _anonymize_factor(factor):
+    if not isinstance(factor, dict) or "value" not in factor:
+        return factor
+    factor = dict(factor)
+    if factor.get("feature") not in CAPTURED_FEATURES:
+        del factor["value"]
+    elif factor.get("feature") == "RIDAGEYR":
+        factor["value"] = _top_code_age(factor["value"])
+    return factor
+
+
+def _top_code_age(age):
+    if isinstance(age, (int, float)) and age > AGE_TOP_CODE:
+        return AGE_TOP_CODE
+    return age
+
+
+def record_exchange(endpoint, payload, response, latency_seconds, error=None):
+    """Append one request/response pair to the capture log; a no-op unless capturing."""
+    if not capture_enabled():
+        return
+    body = None
+    if response is not None:
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+    append_jsonl(CAPTURE_LOG_PATH, {
+        "t": time.time(),
+        "endpoint": endpoint,
+        "request": anonymize_request(payload),
+        "status": response.status_code if response is not None else None,
+        "latency_ms": round(latency_seconds * 1000, 3),
+        "error": type(error).__name__ if error is not None else None,
+        "response": anonymize_response(body)
+    }, CAPTURE_LOG_MAX_BYTES, backups=CAPTURE_LOG_BACKUPS)
+
+
+def capture_files(path=CAPTURE_LOG_PATH, backups=CAPTURE_LOG_BACKUPS):
+    """Return a capture log and its rotated backups, oldest first."""
+    path = Path(path)
+    rotated = [path.with_name(f"{path.name}.{index}") for index in range(backups, 0, -1)]
+    return [p for p in rotated + [path] if p.exists()]
+
+
+def read_capture(path=CAPTURE_LOG_PATH, backups=CAPTURE_LOG_BACKUPS):
+    """Return every captured exchange, oldest first."""
+    return sorted(read_jsonl(capture_files(path, backups)), key=lambda record: record["t"])
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+# NHANES exam weight; estimates from participants who completed the MEC exam
+# represent the civilian non-institutionalized US population
+WEIGHT_COLUMN = "WTMEC2YR"
+
+
+def group_codes(values, categories):
+    """
+    Map values to integer group codes 0..len(categories)-1.
+
+    Values outside `categories` (including NaN) get -1 and are left out of
+    every grouped estimate.
+    """
+    codes = pd.Categorical(values, categories=categories).codes
+    return np.asarray(codes, dtype=np.int64)
+
+
+def survey_weights(frame, cycles=1):
+    """
+    Return the exam weights of a frame as a float64 array (0 where missing).
+
+    When several 2-year cycles are pooled, NHANES guidance is to divide the
+    weights by the number of cycles so totals still describe one population.
+    """
+    if WEIGHT_COLUMN not in frame.columns:
+        return None
+    weights = pd.to_numeric(frame[WEIGHT_COLUMN], errors="coerce").to_numpy(dtype=np.float64)
+    weights = np.where(np.isnan(weights) | (weights < 0), 0.0, weights)
+    return weights / max(cycles, 1)
+
+
+def _usable(weights, codes, values=None):
+    keep = (weights > 0) & (codes >= 0)
+    if values is not None:
+        keep &= ~np.isnan(values)
+    return keep
+
+
+def weighted_totals(weights, codes, n_groups):
+    """Sum of weights per group (an estimated population count) in one bincount."""
+    keep = _usable(weights, codes)
+    return np.bincount(codes[keep], weights=weights[keep], minlength=n_groups)
+
+
+def weighted_mean(values, weights, codes, n_groups):
+    """Weighted mean, standard deviation and unweighted sample size per group."""
+    values = np.asarray(values, dtype=np.float64)
+    keep = _usable(weights, codes, values)
+    codes, weights, values = codes[keep], weights[keep], values[keep]
+    total = np.bincount(codes, weights=weights, minlength=n_groups)
+    sums = np.bincount(codes, weights=weights * values, minlength=n_groups)
+    squares = np.bincount(codes, weights=weights * values ** 2, minlength=n_groups)
+    counts = np.bincount(codes, minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = sums / total
+        std = np.sqrt(np.maximum(squares / total - mean ** 2, 0.0))
+    return mean, std, counts
+
+
+def weighted_proportion(values, weights, codes, n_groups, case=1, valid=(1, 2)):
+    """
+    Weighted share of `case` among `valid` responses per group.
+
+    Returns (proportion, cases, respondents, effective_n); the counts are
+    unweighted. `effective_n` is Kish's
+    (sum w)^2 / sum w^2, the sample size an unweighted estimate with the same
+    precision would need; interval estimates should use it in place of the
+    raw count.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    keep = _usable(weights, codes) & np.isin(values, valid)
+    codes, weights, values = codes[keep], weights[keep], values[keep]
+    total = np.bincount(codes, weights=weights, minlength=n_groups)
+    is_case = values == case
+    case_weight = np.bincount(codes, weights=weights * is_case, minlength=n_groups)
+    squares = np.bincount(codes, weights=weights ** 2, minlength=n_groups)
+    cases = np.bincount(codes[is_case], minlength=n_groups)
+    respondents = np.bincount(codes, minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        proportion = case_weight / total
+        effective_n = total ** 2 / squares
+    return proportion, cases, respondents, np.nan_to_num(effective_n)
+
+
+def weighted_quantiles(values, weights, codes, n_groups, qs):
+    """
+    Weighted quantiles per group, shape (n_groups, len(qs)).
+
+    Rows are sorted once by (group, value); because the running sum of
+    weights never decreases, every group's quantile is found with a single
+    searchsorted of (weight before the group + q * group weight) into it.
+    The result is the smallest value whose cumulative weight reaches q.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    qs = np.atleast_1d(np.asarray(qs, dtype=np.float64))
+    keep = _usable(weights, codes, values)
+    codes, weights, values = codes[keep], weights[keep], values[keep]
+    result = np.full((n_groups, len(qs)), np.nan)
+    if len(values) == 0:
+        return result
+
+    order = np.lexsort((values, codes))
+    codes, weights, values = codes[order], weights[order], values[order]
+    cumulative = np.cumsum(weights)
+    total = np.bincount(codes, weights=weights, minlength=n_groups)
+    before = np.concatenate([[0.0], np.cumsum(total)[:-1]])
+
+    present = np.flatnonzero(total > 0)
+    targets = before[present, None] + qs[None, :] * total[present, None]
+    positions = np.searchsorted(cumulative, targets, side="left")
+    # Keep each lookup inside its own group despite floating-point round-off
+    first = np.searchsorted(codes, present, side="left")
+    last = np.searchsorted(codes, present, side="right") - 1
+    result[present] = values[np.clip(positions, first[:, None], last[:, None])]
+    return result